@@ -0,0 +1,41 @@
+import re
+import sys
+import timeit
+
+from utils.classmatcher import WindowClassMatcher
+from widgets.windowtitle import WINDOW_TITLE_MAP
+
+
+# Function to compare the matcher against searching every entry in turn,
+# run as `python -m benchmarks.classmatcher [count]`
+def benchmark(count: int = 100_000):
+    def linear(win_class: str):
+        # What the window title widget used to do on every title change
+        return next(
+            (wt for wt in WINDOW_TITLE_MAP if re.search(wt[0], win_class.lower())),
+            None,
+        )
+
+    matcher = WindowClassMatcher(WINDOW_TITLE_MAP)
+    classes = {
+        "exact": "firefox",
+        "regex": "org.kde.dolphin",
+        "fallback": "some-unknown-app",
+    }
+
+    for name, win_class in classes.items():
+        if matcher.match(win_class) != linear(win_class):
+            raise SystemExit(f"{win_class}: the matcher disagrees with re.search")
+
+        scanned = timeit.timeit(lambda: linear(win_class), number=count)
+        missed = timeit.timeit(lambda: matcher._match(win_class), number=count)
+        cached = timeit.timeit(lambda: matcher.match(win_class), number=count)
+        print(
+            f"{name:<9} linear {scanned / count * 1_000_000:>7.2f} µs  "
+            f"miss {missed / count * 1_000_000:>6.2f} µs  "
+            f"hit {cached / count * 1_000_000:>6.2f} µs"
+        )
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:2]))
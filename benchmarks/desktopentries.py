@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import timeit
+
+from utils.desktopentries import DesktopEntryIndex, parse_desktop_entry
+
+
+# Function to compare indexed lookups against reading every desktop file,
+# run as `python -m benchmarks.desktopentries [count]`
+def benchmark(count: int = 2000, lookups: int = 100):
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(count):
+            with open(os.path.join(directory, f"app{index}.desktop"), "w") as file:
+                file.write(
+                    "[Desktop Entry]\n"
+                    f"Name=Application {index}\n"
+                    f"Exec=/usr/bin/app{index} %U\n"
+                    f"Icon=app{index}\n"
+                    f"StartupWMClass=App{index}\n"
+                )
+
+        def scan(window_class: str):
+            # What the taskbar used to do for every window on every render, most
+            # classes never appear in a Name so every file ends up being read
+            for desktop_file in os.listdir(directory):
+                entry = parse_desktop_entry(os.path.join(directory, desktop_file))
+                if window_class in entry.get("Name", "").lower():
+                    return entry.get("Icon")
+            return None
+
+        # Spread over the whole tree rather than the first few entries
+        classes = [f"app{i * 7 % count}" for i in range(lookups)]
+        # Classes no desktop entry knows about, looked up on every render
+        unknown = [f"unknown{i}" for i in range(lookups)]
+        index = DesktopEntryIndex([directory], cache_file=None)
+
+        build = timeit.timeit(index.build, number=1)
+        indexed = timeit.timeit(lambda: [index.lookup(c) for c in classes], number=1)
+        missed = timeit.timeit(lambda: [index.lookup(c) for c in unknown], number=1)
+        cached = timeit.timeit(lambda: [index.lookup(c) for c in unknown], number=1)
+        scanned = timeit.timeit(lambda: [scan(c) for c in classes], number=1)
+
+    print(f"build index      {build * 1000:>10.2f} ms for {count} files")
+    print(f"indexed lookups  {indexed / lookups * 1_000_000:>10.2f} µs per lookup")
+    print(f"first misses     {missed / lookups * 1_000_000:>10.2f} µs per lookup")
+    print(f"cached misses    {cached / lookups * 1_000_000:>10.2f} µs per lookup")
+    print(f"scanned lookups  {scanned / lookups * 1_000_000:>10.2f} µs per lookup")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:2]))
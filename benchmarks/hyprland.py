@@ -0,0 +1,249 @@
+import os
+import random
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from types import SimpleNamespace
+
+from gi.repository import GLib
+
+from utils.hyprland import READ_SIZE, HyprlandClient, HyprlandEventBus
+
+# Events the taskbar subscribes to
+TASKBAR_EVENTS = (
+    "openwindow",
+    "closewindow",
+    "movewindowv2",
+    "windowtitlev2",
+    "activewindowv2",
+    "changefloatingmode",
+)
+
+
+# Function to compare blocking requests against the client on a fake hyprland
+# that takes `delay` ms per request, run as `python -m benchmarks.hyprland [count]`
+def benchmark(count: int = 200, delay: float = 5):
+    class FakeHyprland(socketserver.BaseRequestHandler):
+        def handle(self):
+            request = self.request.recv(READ_SIZE)
+            time.sleep(delay / 1000)
+            if request.startswith(b"dispatch"):
+                self.request.sendall(b"ok")
+            else:
+                self.request.sendall(b'{"address": "0x1234"}')
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, ".socket.sock")
+        server = socketserver.ThreadingUnixStreamServer(path, FakeHyprland)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        # What fabric's send_command does, one round trip at a time
+        def request(payload: bytes):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(path)
+                sock.sendall(payload)
+                while sock.recv(READ_SIZE):
+                    pass
+
+        def run_blocking(send):
+            latencies = []
+            for _ in range(count):
+                start = time.perf_counter()
+                send()
+                latencies.append(time.perf_counter() - start)
+            # Nothing else runs while waiting, the main loop stalls every time
+            return latencies, sum(latencies), max(latencies)
+
+        client = HyprlandClient(path)
+
+        def run_async(send, burst: bool = False):
+            loop = GLib.MainLoop()
+            latencies = []
+            # Longest time the main loop went without running a 1 ms timer
+            stall = [0.0, time.perf_counter()]
+
+            def on_tick():
+                now = time.perf_counter()
+                stall[0] = max(stall[0], now - stall[1])
+                stall[1] = now
+                return True
+
+            def on_reply(start: float, _):
+                latencies.append(time.perf_counter() - start)
+                if len(latencies) == count:
+                    loop.quit()
+                elif not burst:
+                    send(partial(on_reply, time.perf_counter()))
+
+            tick = GLib.timeout_add(1, on_tick)
+            started = time.perf_counter()
+            for _ in range(count if burst else 1):
+                send(partial(on_reply, time.perf_counter()))
+            loop.run()
+            GLib.source_remove(tick)
+            return latencies, time.perf_counter() - started, stall[0]
+
+        results = {
+            "request, blocking": run_blocking(lambda: request(b"j/activewindow")),
+            "request, async": run_async(
+                lambda callback: client.send("j/activewindow", callback)
+            ),
+            "request, burst": run_async(
+                lambda callback: client.send("j/activewindow", callback), burst=True
+            ),
+            # Spawning hyprctl, with `true` standing in for its startup
+            "click, hyprctl": run_blocking(
+                lambda: (
+                    subprocess.run(["true"]),
+                    request(b"dispatch focuswindow address:0x1234"),
+                )
+            ),
+            "click, dispatch": run_async(
+                lambda callback: client.dispatch(
+                    "focuswindow address:0x1234", callback=callback
+                )
+            ),
+        }
+        server.shutdown()
+
+    def percentile(samples: list[float], fraction: float) -> float:
+        return sorted(samples)[int(len(samples) * fraction)] * 1000
+
+    for name, (latencies, elapsed, stall) in results.items():
+        print(
+            f"{name:<18} p50 {percentile(latencies, 0.5):>7.2f} ms  "
+            f"p99 {percentile(latencies, 0.99):>7.2f} ms  "
+            f"done in {elapsed:.2f} s, longest main loop stall {stall * 1000:.2f} ms"
+        )
+
+
+# Function to make up a trace of events like hyprland sends them, as lines of
+# `<ms>\t<name>>><data>`. A real one can be recorded with
+# socat -u UNIX-CONNECT:"$(dirname <request socket>)/.socket2.sock" - |
+#   while read -r line; do printf '%s\t%s\n' "$(date +%s%3N)" "$line"; done
+def make_trace(path: str, count: int = 10_000, seed: int = 0):
+    rng = random.Random(seed)
+    now = 0.0
+    windows = [f"{address:x}" for address in range(0x1000, 0x1008)]
+    events = 0
+
+    with open(path, "w") as file:
+        while events < count:
+            window = rng.choice(windows)
+            title = f"Page {rng.randrange(100)}, some site"
+            workspace = rng.randrange(1, 6)
+            burst = rng.choice(
+                [
+                    # Opening a window
+                    [
+                        f"openwindow>>{window},{workspace},firefox,{title}",
+                        f"activewindow>>firefox,{title}",
+                        f"activewindowv2>>{window}",
+                        f"windowtitle>>{window}",
+                        f"windowtitlev2>>{window},{title}",
+                        f"windowtitlev2>>{window},{title}",
+                    ],
+                    # Switching workspaces
+                    [
+                        f"workspace>>{workspace}",
+                        f"workspacev2>>{workspace},{workspace}",
+                        f"activewindow>>firefox,{title}",
+                        f"activewindowv2>>{window}",
+                    ],
+                    # Moving a window
+                    [
+                        f"movewindow>>{window},{workspace}",
+                        f"movewindowv2>>{window},{workspace},{workspace}",
+                        f"activewindowv2>>{window}",
+                    ],
+                    # A page streaming title updates
+                    [f"windowtitlev2>>{window},{title}"] * rng.randrange(2, 12),
+                    # Focus following the mouse
+                    [f"activewindowv2>>{rng.choice(windows)}" for _ in range(3)],
+                ]
+            )
+            for line in burst:
+                # Events of a burst arrive within a few milliseconds
+                now += rng.uniform(0, 3)
+                file.write(f"{now:.2f}\t{line}\n")
+                events += 1
+            now += rng.uniform(5, 400)
+
+
+class FakeConnection:
+    """Stands in for fabric's hyprland connection, keeping the event handlers."""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def connect(self, signal: str, handler):
+        self.handlers[signal.removeprefix("event::")] = handler
+
+    def send(self, line: str):
+        name, _, data = line.partition(">>")
+        if name in self.handlers:
+            self.handlers[name](self, SimpleNamespace(name=name, data=data.split(",")))
+
+
+# Function to read a trace written by make_trace into (ms, line) pairs
+def read_trace(path: str) -> list[tuple[float, str]]:
+    with open(path) as file:
+        return [
+            (float(time_ms), line)
+            for time_ms, line in (
+                line.rstrip("\n").split("\t", 1) for line in file if line.strip()
+            )
+        ]
+
+
+# Function to feed a trace through the event bus a frame at a time, returns the
+# bus, the batches a taskbar would render and the number of frames drawn
+def replay_trace(trace: list[tuple[float, str]], frame: float = 1000 / 60):
+    connection = FakeConnection()
+    bus = HyprlandEventBus(connection)
+    renders = []
+    bus.subscribe(renders.append, *TASKBAR_EVENTS)
+
+    frames = 0
+    frame_end = None
+    for time_ms, line in trace:
+        if frame_end is not None and time_ms >= frame_end:
+            # The main loop got to draw a frame since the last event
+            bus.flush()
+            frames += 1
+            frame_end = None
+        if frame_end is None:
+            frame_end = (time_ms // frame + 1) * frame
+        connection.send(line)
+
+    bus.flush()
+    return bus, renders, frames + 1
+
+
+# Function to count the renders a taskbar would do for a trace, recorded or made
+# up, run as `python -m benchmarks.hyprland replay [trace]`
+def replay(path: str | None = None, frame: float = 1000 / 60):
+    with tempfile.TemporaryDirectory() as directory:
+        if path is None:
+            path = os.path.join(directory, "events.trace")
+            make_trace(path)
+        trace = read_trace(path)
+
+    bus, renders, frames = replay_trace(trace, frame)
+    print(
+        f"{len(trace)} events over {frames} frames, {bus.received} for the taskbar "
+        f"and {bus.delivered} of those after dropping repeats: "
+        f"{len(renders)} renders instead of {bus.received}"
+    )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["replay"]:
+        replay(*sys.argv[2:3])
+    else:
+        benchmark(*map(int, sys.argv[1:2]))
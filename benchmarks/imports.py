@@ -0,0 +1,55 @@
+import os
+import statistics
+import subprocess
+import sys
+
+from utils.widget_config import DEFAULT_CONFIG
+from widgets import WIDGETS
+
+# Run in a fresh interpreter every time, so no module is cached from a previous run
+IMPORT_LAYOUT = """
+import sys
+import time
+
+start = time.perf_counter()
+import modules.bar
+from widgets import get_widget
+
+for name in sys.argv[1:]:
+    get_widget(name)
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+# Function to time importing the bar along with the widgets of a layout, run as
+# `python -m benchmarks.imports [runs]`
+def benchmark(runs: int = 5):
+    layouts = {
+        "default": [
+            name for names in DEFAULT_CONFIG["layout"].values() for name in names
+        ],
+        "full": list(WIDGETS),
+    }
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def timed(names: list[str]) -> float:
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_LAYOUT, *names],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        # Widgets may log while importing, the time is always printed last
+        return float(result.stdout.splitlines()[-1])
+
+    for layout, names in layouts.items():
+        samples = [timed(names) for _ in range(runs)]
+        print(
+            f"{layout:<8} {len(names):>2} widgets "
+            f"{statistics.median(samples):>9.2f} ms median of {runs}"
+        )
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:2]))
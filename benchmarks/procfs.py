@@ -0,0 +1,29 @@
+import sys
+import timeit
+
+import psutil
+
+from utils.procfs import PROC_DIR, CpuReader, MemoryReader
+
+
+# Function to compare the readers against psutil, run as `python -m benchmarks.procfs`
+def benchmark(proc_dir: str = PROC_DIR, number: int = 10000):
+    cpu = CpuReader(proc_dir)
+    memory = MemoryReader(proc_dir)
+
+    results = {
+        "procfs cpu": timeit.timeit(cpu.usage, number=number),
+        "psutil cpu": timeit.timeit(psutil.cpu_percent, number=number),
+        "procfs memory": timeit.timeit(memory.usage, number=number),
+        "psutil memory": timeit.timeit(psutil.virtual_memory, number=number),
+    }
+
+    for name, seconds in results.items():
+        print(f"{name:<14} {seconds / number * 1_000_000:>8.2f} µs per call")
+
+    cpu.close()
+    memory.close()
+
+
+if __name__ == "__main__":
+    benchmark(*sys.argv[1:2])
@@ -0,0 +1,96 @@
+import statistics
+import sys
+import time
+
+import gi
+from loguru import logger
+
+from utils.stylesheet import (
+    MAIN_CSS,
+    MAIN_SCSS,
+    compile_scss,
+    compile_theme,
+    get_theme_names,
+)
+
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gdk, Gtk  # noqa: E402
+
+logger.disable("utils.stylesheet")
+
+
+# Function to compare a theme switch that replaces one stylesheet holding both the
+# layout and the colors against one that only swaps the palette, run as
+# `python -m benchmarks.restyle [runs] [widgets]`
+def benchmark(runs: int = 20, widgets: int = 300):
+    themes = get_theme_names()[:2]
+    palettes = [compile_theme(theme) for theme in themes]
+    if not (compile_scss(MAIN_SCSS, MAIN_CSS) and all(palettes)):
+        raise SystemExit("sass failed, run `python main.py --build-themes` first")
+
+    with open(MAIN_CSS) as file:
+        layout = file.read()
+    bundles = []
+    for palette in palettes:
+        with open(palette) as file:
+            # What every theme used to compile to before the palette was split out
+            bundles.append(file.read() + layout)
+
+    # Enough styled widgets for the restyle to show up next to the parsing
+    window = Gtk.OffscreenWindow()
+    box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+    for index in range(widgets):
+        row = Gtk.Box(name="bar-inner")
+        row.get_style_context().add_class("panel-box")
+        label = Gtk.Label(label=f"widget {index}")
+        label.get_style_context().add_class("panel-text")
+        row.add(label)
+        box.add(row)
+    window.add(box)
+    window.show_all()
+
+    screen = Gdk.Screen.get_default()
+    current = None
+
+    def swap(provider: Gtk.CssProvider):
+        nonlocal current
+        if current:
+            Gtk.StyleContext.remove_provider_for_screen(screen, current)
+        Gtk.StyleContext.add_provider_for_screen(
+            screen, provider, Gtk.STYLE_PROVIDER_PRIORITY_USER
+        )
+        current = provider
+        # Styles are only recomputed once the main loop gets to run
+        while Gtk.events_pending():
+            Gtk.main_iteration_do(False)
+
+    def timed(load) -> list[float]:
+        samples = []
+        for run in range(runs):
+            start = time.perf_counter()
+            provider = Gtk.CssProvider()
+            load(provider, run % len(themes))
+            swap(provider)
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
+
+    bundled = timed(
+        lambda provider, index: provider.load_from_data(bundles[index].encode())
+    )
+    Gtk.StyleContext.remove_provider_for_screen(screen, current)
+    current = None
+
+    layout_provider = Gtk.CssProvider()
+    layout_provider.load_from_path(MAIN_CSS)
+    Gtk.StyleContext.add_provider_for_screen(
+        screen, layout_provider, Gtk.STYLE_PROVIDER_PRIORITY_USER
+    )
+    # Parsed again on every switch, although ThemeManager keeps them cached
+    split = timed(lambda provider, index: provider.load_from_path(palettes[index]))
+
+    print(f"whole stylesheet {statistics.median(bundled):>9.2f} ms median of {runs}")
+    print(f"palette only     {statistics.median(split):>9.2f} ms median of {runs}")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:3]))
@@ -0,0 +1,88 @@
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from gi.repository import GLib
+from loguru import logger
+
+from services.stylesheet import SassWatcher
+from utils.stylesheet import STYLES_DIR, get_sass_command
+
+logger.disable("services.stylesheet")
+
+
+# Function to compare how long a style change takes to land in the css with the
+# persistent watcher and with a one-shot sass, run as
+# `python -m benchmarks.sasswatcher [runs]`
+def benchmark(runs: int = 10, timeout: int = 10_000):
+    if shutil.which("sass") is None:
+        raise SystemExit("sass is needed to compile the stylesheet")
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Edited on every run, a copy keeps a running bar from noticing
+        styles = os.path.join(directory, "styles")
+        shutil.copytree(STYLES_DIR, styles)
+        entry = os.path.join(styles, "main.scss")
+        output = os.path.join(directory, "main.css")
+
+        def touch(run: int):
+            # A changed comment is enough for sass to compile again
+            with open(entry, "a") as file:
+                file.write(f"\n// benchmark run {run}\n")
+
+        watcher = SassWatcher(targets=[(entry, output)])
+        loop = GLib.MainLoop()
+
+        def wait_for_compile() -> bool:
+            compiled = []
+
+            def on_compiled(*_):
+                compiled.append(True)
+                loop.quit()
+
+            def on_timeout():
+                loop.quit()
+                return False
+
+            handler = watcher.connect("compiled", on_compiled)
+            timeout_id = GLib.timeout_add(timeout, on_timeout)
+            loop.run()
+            watcher.disconnect(handler)
+            if compiled:
+                GLib.source_remove(timeout_id)
+            return bool(compiled)
+
+        if not watcher.start():
+            raise SystemExit("sass --watch failed to start")
+        # The first compile also covers sass starting up, so it is not counted
+        if not wait_for_compile():
+            watcher.stop()
+            raise SystemExit("the watcher never compiled the stylesheet")
+
+        watched = []
+        for run in range(runs):
+            start = time.perf_counter()
+            touch(run)
+            if not wait_for_compile():
+                watcher.stop()
+                raise SystemExit("the watcher missed a change")
+            watched.append((time.perf_counter() - start) * 1000)
+        watcher.stop()
+
+        one_shot = []
+        for run in range(runs):
+            start = time.perf_counter()
+            touch(runs + run)
+            subprocess.run(get_sass_command(entry, output), check=True)
+            one_shot.append((time.perf_counter() - start) * 1000)
+
+    print(f"watcher   {statistics.median(watched):>9.2f} ms median of {runs}")
+    print(f"one-shot  {statistics.median(one_shot):>9.2f} ms median of {runs}")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:2]))
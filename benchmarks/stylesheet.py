@@ -0,0 +1,45 @@
+import contextlib
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from loguru import logger
+
+from utils.stylesheet import MAIN_SCSS, compile_scss, get_hash_stamp
+
+logger.disable("utils.stylesheet")
+
+
+# Function to compare a startup compile that runs sass against one served from
+# the hash cache, run as `python -m benchmarks.stylesheet [runs]`
+def benchmark(runs: int = 5):
+    if shutil.which("sass") is None:
+        raise SystemExit("sass is needed to compile the stylesheet")
+
+    def timed(output: str) -> float:
+        start = time.perf_counter()
+        if not compile_scss(MAIN_SCSS, output):
+            raise SystemExit("sass failed to compile the stylesheet")
+        return (time.perf_counter() - start) * 1000
+
+    cold = []
+    warm = []
+    # Compiled next to the real one would overwrite dist/main.css
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "main.css")
+        for _ in range(runs):
+            # Without its stamp the css looks outdated, so sass runs again
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(get_hash_stamp(output))
+            cold.append(timed(output))
+            warm.append(timed(output))
+
+    print(f"cold (sass)  {statistics.median(cold):>9.2f} ms median of {runs}")
+    print(f"warm (cache) {statistics.median(warm):>9.2f} ms median of {runs}")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:2]))
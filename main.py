@@ -1,26 +1,35 @@
-import setproctitle
-from fabric import Application
-from fabric.utils import exec_shell_command, get_relative_path, monitor_file
+import argparse
+
 from loguru import logger
 
 import utils.functions as helpers
-from modules.bar import StatusBar
-from modules.notifications import NotificationPopup
-from modules.osd import OSDContainer
 from utils.colors import Colors
-from utils.widget_config import widget_config
+from utils.profiler import PROFILE_FLAG, profiler
+from utils.stylesheet import compile_all_themes
+
 
+def process_and_apply_css():
+    from utils.config import get_theme_manager
+    from utils.widget_config import widget_config
 
-def process_and_apply_css(app: Application):
     if not helpers.executable_exists("sass"):
         raise helpers.ExecutableNotFoundError(
             "sass"
         )  # Raise an error if sass is not found and exit the application
 
-    logger.info(f"{Colors.OKBLUE}[Main] Compiling CSS")
-    exec_shell_command("sass styles/main.scss dist/main.css --no-source-map")
-    logger.info(f"{Colors.OKBLUE}[Main] CSS applied")
-    app.set_stylesheet_from_file(get_relative_path("dist/main.css"))
+    logger.info(f"{Colors.OKBLUE}[Main] Applying CSS")
+    # Sass is only run when the theme's bundle is missing or its sources changed
+    get_theme_manager().set_theme(widget_config["theme"]["name"])
+
+
+def build_themes():
+    if not helpers.executable_exists("sass"):
+        raise helpers.ExecutableNotFoundError("sass")
+
+    logger.info(f"{Colors.OKBLUE}[Main] Compiling the stylesheet of every theme")
+    failed = compile_all_themes()
+    if failed:
+        logger.error(f"{Colors.FAIL}[Main] Failed to compile: {', '.join(failed)}")
 
 
 APPLICATION_NAME = "hydepanel"
@@ -28,23 +37,82 @@ APPLICATION_NAME = "hydepanel"
 logger.disable("fabric.hyprland.widgets")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog=APPLICATION_NAME)
+    parser.add_argument(
+        "--build-themes",
+        action="store_true",
+        help="compile the stylesheet of every theme ahead of time and exit",
+    )
+    parser.add_argument(
+        PROFILE_FLAG,
+        nargs="?",
+        const=profiler.output,
+        metavar="TRACE",
+        help="log how long startup took and write a chrome trace (default: %(const)s)",
+    )
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        profiler.enabled = True
+        profiler.output = args.profile_startup
+
+    if args.build_themes:
+        build_themes()
+        raise SystemExit
+
+    # Imported only now so that --build-themes never creates a widget or a service
+    import setproctitle
+    from fabric import Application
+    from fabric.utils import get_relative_path, monitor_file
+
+    from modules.bar import StatusBar
+    from modules.notifications import NotificationPopup
+    from modules.osd import OSDContainer
+    from shared import binder
+    from utils.config import (
+        get_activity_monitor,
+        get_polling_policy,
+        get_theme_manager,
+    )
+
     # Create the status bar
-    bar = StatusBar()
-    notifications = NotificationPopup()
-    system_overlay = OSDContainer()
+    with profiler.measure("StatusBar", "window"):
+        bar = StatusBar()
+    with profiler.measure("NotificationPopup", "window"):
+        notifications = NotificationPopup()
+    with profiler.measure("OSDContainer", "window"):
+        system_overlay = OSDContainer()
 
     # Initialize the application with the status bar
-    app = Application(APPLICATION_NAME, bar, notifications, system_overlay)
+    with profiler.measure("Application"):
+        app = Application(APPLICATION_NAME, bar, notifications, system_overlay)
 
     setproctitle.setproctitle(APPLICATION_NAME)
 
-    helpers.copy_theme(widget_config["theme"]["name"])
+    with profiler.measure("process_and_apply_css", "css"):
+        process_and_apply_css()
 
-    # Monitor styles folder for changes
+    # The profile is reported once every window has been drawn for the first time
+    profiler.track_window("bar", bar)
+    profiler.track_window("notifications", notifications)
+    profiler.track_window("osd", system_overlay)
+
+    # Monitor styles folder for changes, the theme is rebuilt in the background
     main_css_file = monitor_file(get_relative_path("styles"))
-    main_css_file.connect("changed", lambda *_: process_and_apply_css(app))
+    main_css_file.connect("changed", get_theme_manager().queue_rebuild)
 
-    process_and_apply_css(app)
+    # Slow down or pause the pollers the bar registered, depending on power
+    # and on whether the bar can be seen at all
+    get_polling_policy()
+    get_activity_monitor()
 
     # Run the application
     app.run()
+
+    # Sass would otherwise outlive the bar and keep watching the styles
+    get_theme_manager().stop()
+
+    logger.info(
+        f"{Colors.OKBLUE}[Main] {binder.saved} redundant widget updates skipped, "
+        f"{binder.applied} applied"
+    )
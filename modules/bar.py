@@ -1,32 +1,12 @@
 from fabric.widgets.box import Box
 from fabric.widgets.centerbox import CenterBox
 from fabric.widgets.wayland import WaylandWindow as Window
+from loguru import logger
 
+from utils.colors import Colors
+from utils.profiler import profiler
 from utils.widget_config import widget_config
-from widgets import (
-    Battery,
-    BlueToothWidget,
-    BrightnessWidget,
-    CalendarWidget,
-    CpuWidget,
-    DateTimeWidget,
-    HyprIdleWidget,
-    HyprSunsetWidget,
-    KeyboardLayoutWidget,
-    LanguageWidget,
-    MemoryWidget,
-    Mpris,
-    PowerButton,
-    StorageWidget,
-    SystemTray,
-    TaskBarWidget,
-    ThemeSwitcherWidget,
-    UpdatesWidget,
-    VolumeWidget,
-    WeatherWidget,
-    WindowTitleWidget,
-    WorkSpacesWidget,
-)
+from widgets import WIDGETS, get_widget
 
 
 class StatusBar(Window):
@@ -45,46 +25,6 @@ class StatusBar(Window):
             all_visible=False,
         )
 
-        self.widgets_list = {
-            # Workspaces: Displays the list of workspaces or desktops
-            "workspaces": WorkSpacesWidget,
-            "system_tray": SystemTray,
-            "task_bar": TaskBarWidget,
-            "calendar": CalendarWidget,
-            "bluetooth": BlueToothWidget,
-            "keyboard": KeyboardLayoutWidget,
-            "brightness": BrightnessWidget,
-            "power": PowerButton,
-            # WindowTitle: Shows the title of the current window
-            "window_title": WindowTitleWidget,
-            # LanguageBox: Displays the current language selection
-            "language": LanguageWidget,
-            # DateTime: Displays the current date and time
-            "datetime": DateTimeWidget,
-            "volume": VolumeWidget,
-            # HyprSunset: Provides information about the sunset time based on location
-            "hypr_sunset": HyprSunsetWidget,
-            # # HyprIdle: Shows the idle time for the system
-            "hypr_idle": HyprIdleWidget,
-            # Battery: Displays the battery status with optional label and tooltip
-            "battery": Battery,
-            # Cpu: Displays CPU usage information with optional label and tooltip
-            "cpu": CpuWidget,
-            # # ClickCounter: Tracks the number of clicks on a widget or component
-            # "click_counter": ClickCounter(),
-            # Memory: Displays the system's memory usage
-            "memory": MemoryWidget,
-            # Storage: Shows the system's storage usage (e.g., disk space)
-            "storage": StorageWidget,
-            # Weather: Displays the weather for a given city (e.g., Kathmandu)
-            "weather": WeatherWidget,
-            # Mpris: Displays information about the current media player status
-            "mpris": Mpris,
-            # Updates: Shows available system updates based on the OS
-            "updates": UpdatesWidget,
-            "theme_switcher": ThemeSwitcherWidget,
-        }
-
         layout = self.make_layout()
 
         self.children = CenterBox(
@@ -117,9 +57,15 @@ class StatusBar(Window):
         layout = {"left_section": [], "middle_section": [], "right_section": []}
 
         for key in layout:
-            layout[key].extend(
-                self.widgets_list[widget](widget_config)
-                for widget in widget_config["layout"][key]
-            )
+            for widget in widget_config["layout"][key]:
+                if widget not in WIDGETS:
+                    logger.error(f"{Colors.FAIL}[Bar] Unknown widget '{widget}'")
+                    continue
+                # Widget modules are imported here, only when the layout uses them
+                with profiler.measure(f"import: {widget}", "import"):
+                    widget_class = get_widget(widget)
+
+                with profiler.measure(f"widget: {widget}", "widget"):
+                    layout[key].append(widget_class(widget_config))
 
         return layout
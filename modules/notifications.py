@@ -21,6 +21,7 @@ from gi.repository import GdkPixbuf, GLib, GObject
 import utils.functions as helpers
 import utils.icons as icons
 from shared import AnimatedCircularProgressBar, CustomImage
+from utils.profiler import profiler
 
 gi.require_version("GdkPixbuf", "2.0")
 
@@ -291,7 +292,8 @@ class NotificationPopup(WaylandWindow):
     """A widget to grab and display notifications."""
 
     def __init__(self):
-        self._server = Notifications()
+        with profiler.measure("Notifications()", "service"):
+            self._server = Notifications()
         self.notifications = Box(
             v_expand=True,
             h_expand=True,
@@ -1,4 +1,3 @@
-import time
 from typing import ClassVar, Literal
 
 from fabric.widgets.box import Box
@@ -7,12 +6,13 @@ from fabric.widgets.label import Label
 from fabric.widgets.revealer import Revealer
 from fabric.widgets.scale import ScaleMark
 from fabric.widgets.wayland import WaylandWindow as Window
-from gi.repository import GLib, GObject
+from gi.repository import GObject
 
 import utils.functions as helpers
 import utils.icons as icons
 from shared import AnimatedScale
-from utils.config import audio_service, brightness_service
+from utils.config import get_audio_service, get_brightness_service
+from utils.scheduler import scheduler
 
 
 class BrightnessOSDContainer(Box):
@@ -20,7 +20,7 @@ class BrightnessOSDContainer(Box):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs, orientation="h", spacing=12, name="osd-container")
-        self.brightness_service = brightness_service
+        self.brightness_service = get_brightness_service()
         self.level = Label(name="osd-level")
         self.icon = Image(icon_name=icons.icons["brightness"]["screen"], icon_size=28)
         self.scale = self._create_brightness_scale()
@@ -68,7 +68,7 @@ class AudioOSDContainer(Box):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs, orientation="h", spacing=13, name="osd-container")
-        self.audio = audio_service
+        self.audio = get_audio_service()
         self.icon = Image(
             icon_name=icons.icons["audio"]["volume"]["medium"], icon_size=28
         )
@@ -163,7 +163,8 @@ class OSDContainer(Window):
             **kwargs,
         )
 
-        self.last_activity_time = time.time()
+        # One-shot timer hiding the osd, pushed back on every change
+        self._hide_task = None
 
         self.audio_container.audio.connect("notify::speaker", self.show_audio)
         self.brightness_container.brightness_service.connect(
@@ -172,8 +173,6 @@ class OSDContainer(Window):
         )
         self.audio_container.connect("volume-changed", self.show_audio)
 
-        GLib.timeout_add(100, self.check_inactivity)
-
     def show_audio(self, *_):
         self.show_box(box_to_show="audio")
         self.reset_inactivity_timer()
@@ -195,9 +194,5 @@ class OSDContainer(Window):
         self.set_visible(False)
 
     def reset_inactivity_timer(self):
-        self.last_activity_time = time.time()
-
-    def check_inactivity(self):
-        if time.time() - self.last_activity_time >= (self.timeout / 1000):
-            self.start_hide_timer()
-        return True
+        scheduler.remove(self._hide_task)
+        self._hide_task = scheduler.call_later(self.timeout, self.start_hide_timer)
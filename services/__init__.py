@@ -1,5 +1,31 @@
-# ruff: noqa: F403
-from .brightness import *
-from .mpris import *
-from .screenrecord import *
-from .weather import *
+import importlib
+
+# Services mapped to the module providing them, so importing one service does
+# not pull in the dependencies of all the others (Playerctl, D-Bus, ...)
+SERVICES = {
+    "ActivityMonitor": "services.activity",
+    "BatteryStatus": "services.battery",
+    "Brightness": "services.brightness",
+    "NoBrightnessError": "services.brightness",
+    "HyprlandState": "services.hyprland_state",
+    "MprisPlayer": "services.mpris",
+    "MprisPlayerManager": "services.mpris",
+    "PollingPolicy": "services.powerprofile",
+    "PowerProfiles": "services.powerprofile",
+    "ProcessWatcher": "services.processwatch",
+    "ScreenRecorder": "services.screenrecord",
+    "SassWatcher": "services.stylesheet",
+    "StylesheetBuilder": "services.stylesheet",
+    "ThemeManager": "services.stylesheet",
+    "CpuStats": "services.systemstats",
+    "MemoryStats": "services.systemstats",
+    "StorageStats": "services.systemstats",
+    "SystemStats": "services.systemstats",
+    "WeatherInfo": "services.weather",
+}
+
+
+def __getattr__(name: str):
+    if name not in SERVICES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(SERVICES[name]), name)
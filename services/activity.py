@@ -0,0 +1,139 @@
+from fabric.core.service import Property, Service
+from gi.repository import Gio, GLib
+from loguru import logger
+
+from utils.colors import Colors
+from utils.config import get_hyprland_state
+from utils.scheduler import scheduler
+
+LOGIN_BUS = "org.freedesktop.login1"
+
+
+class ActivityMonitor(Service):
+    """Service to pause the pollers while nobody can see the bar.
+
+    That is when every monitor shows a fullscreen window or is switched off, when
+    the session is idle and while the system goes to sleep.
+    """
+
+    @Property(bool, "readable", default_value=True)
+    def active(self) -> bool:
+        return not self._reasons
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._reasons: set[str] = set()
+        self._dpms_check = None
+        # Kept around so the proxies, and their signal handlers, stay alive
+        self._proxies: list[Gio.DBusProxy] = []
+
+        # Monitors, workspaces and windows come from the shared copy of hyprland's
+        # state, which is loaded once and kept current from its events
+        self.hyprland_state = get_hyprland_state()
+        self.hyprland_state.connect("changed", self.on_state_changed)
+        self.check_monitors()
+
+        self._new_proxy(
+            "/org/freedesktop/login1",
+            "org.freedesktop.login1.Manager",
+            self._on_manager_ready,
+        )
+        self._new_proxy(
+            "/org/freedesktop/login1/session/auto",
+            "org.freedesktop.login1.Session",
+            self._on_session_ready,
+        )
+
+    def set_reason(self, reason: str, enabled: bool):
+        if enabled == (reason in self._reasons):
+            return
+
+        if enabled:
+            self._reasons.add(reason)
+            scheduler.pause(reason)
+        else:
+            self._reasons.discard(reason)
+            scheduler.resume(reason)
+
+        logger.debug(
+            f"{Colors.OKBLUE}[Activity] Pollers "
+            f"{'paused' if self._reasons else 'resumed'} ({reason})"
+        )
+        self.notify("active")
+
+    def on_state_changed(self, _, kind: str):
+        if kind in ("monitors", "workspaces", "clients"):
+            self.check_monitors()
+
+    def is_fullscreen(self, workspace_id: int) -> bool:
+        # Maximized windows (mode 1) leave the bar in sight, only mode 2 covers it
+        workspace = self.hyprland_state.workspaces.get(workspace_id, {})
+        if workspace.get("fullscreenMode") == 2:
+            return True
+        return any(
+            client.get("fullscreen") == 2
+            for client in self.hyprland_state.clients_on_workspace(workspace_id)
+        )
+
+    def check_monitors(self, *_):
+        monitors = list(self.hyprland_state.monitors.values())
+        powered = [monitor for monitor in monitors if monitor.get("dpmsStatus", True)]
+        covered = [
+            monitor
+            for monitor in powered
+            if self.is_fullscreen(monitor["activeWorkspace"]["id"])
+        ]
+
+        self.set_reason("dpms", bool(monitors) and not powered)
+        self.set_reason("fullscreen", bool(powered) and covered == powered)
+
+        # Hyprland has no event for dpms, so reload the monitors every now and then
+        # while the screens are off, one-shot timers keep running while paused
+        scheduler.remove(self._dpms_check)
+        self._dpms_check = (
+            scheduler.call_later(5000, self.hyprland_state.queue_sync, "monitors")
+            if "dpms" in self._reasons
+            else None
+        )
+
+    def _new_proxy(self, path: str, interface: str, callback):
+        def on_proxy_ready(_, result):
+            try:
+                proxy = Gio.DBusProxy.new_for_bus_finish(result)
+            except GLib.Error as e:
+                logger.warning(
+                    f"{Colors.WARNING}[Activity] {interface} unavailable: {e.message}"
+                )
+                return
+            self._proxies.append(proxy)
+            callback(proxy)
+
+        Gio.DBusProxy.new_for_bus(
+            Gio.BusType.SYSTEM,
+            Gio.DBusProxyFlags.NONE,
+            None,
+            LOGIN_BUS,
+            path,
+            interface,
+            None,
+            on_proxy_ready,
+        )
+
+    def _on_manager_ready(self, proxy: Gio.DBusProxy):
+        def on_signal(_, _sender, signal: str, parameters: GLib.Variant):
+            if signal == "PrepareForSleep":
+                (sleeping,) = parameters.unpack()
+                self.set_reason("sleep", sleeping)
+
+        proxy.connect("g-signal", on_signal)
+
+    def _on_session_ready(self, proxy: Gio.DBusProxy):
+        def sync_idle_hint(*_):
+            idle_hint = proxy.get_cached_property("IdleHint")
+            if idle_hint is not None:
+                self.set_reason("idle", idle_hint.unpack())
+            # Screens are usually switched off around the time the session idles
+            self.hyprland_state.queue_sync("monitors")
+
+        proxy.connect("g-properties-changed", sync_idle_hint)
+        sync_idle_hint()
@@ -0,0 +1,162 @@
+import glob
+import os
+
+from fabric.core.service import Property, Service, Signal
+from gi.repository import Gio, GLib
+from loguru import logger
+
+from utils.colors import Colors
+from utils.scheduler import scheduler
+
+# The display device aggregates every battery of the system into one
+UPOWER_BUS = (
+    "org.freedesktop.UPower",
+    "/org/freedesktop/UPower/devices/DisplayDevice",
+    "org.freedesktop.UPower.Device",
+)
+POWER_SUPPLY_DIR = "/sys/class/power_supply"
+
+# UPower device states that mean the charger is plugged in
+UPOWER_PLUGGED_STATES = (1, 4, 5)  # charging, fully charged, pending charge
+
+
+class BatteryStatus(Service):
+    """Service to follow the battery through UPower, falling back to sysfs."""
+
+    @Signal
+    def changed(self) -> None:
+        """Signal emitted once after any of the properties changed."""
+
+    @Property(bool, "readable", default_value=False)
+    def present(self) -> bool:
+        return self._status["present"]
+
+    @Property(int, "readable")
+    def percentage(self) -> int:
+        return self._status["percentage"]
+
+    @Property(bool, "readable", default_value=False)
+    def charging(self) -> bool:
+        return self._status["charging"]
+
+    @Property(int, "readable")
+    def time_to_empty(self) -> int:
+        return self._status["time_to_empty"]
+
+    @Property(int, "readable")
+    def time_to_full(self) -> int:
+        return self._status["time_to_full"]
+
+    def __init__(self, interval: int = 2000, **kwargs):
+        super().__init__(**kwargs)
+        # Only used to poll sysfs when UPower is not available
+        self.interval = interval
+
+        self._status = {
+            "present": False,
+            "percentage": 0,
+            "charging": False,
+            "time_to_empty": 0,
+            "time_to_full": 0,
+        }
+        self._proxy: Gio.DBusProxy | None = None
+        self._poll_task = None
+
+        Gio.DBusProxy.new_for_bus(
+            Gio.BusType.SYSTEM,
+            Gio.DBusProxyFlags.NONE,
+            None,
+            *UPOWER_BUS,
+            None,
+            self._on_proxy_ready,
+        )
+
+    def _update(self, **status):
+        changed = [key for key, value in status.items() if self._status[key] != value]
+        if not changed:
+            return
+
+        self._status.update(status)
+        for key in changed:
+            self.notify(key.replace("_", "-"))
+        self.emit("changed")
+
+    def _on_proxy_ready(self, _, result):
+        try:
+            self._proxy = Gio.DBusProxy.new_for_bus_finish(result)
+        except GLib.Error as e:
+            logger.warning(
+                f"{Colors.WARNING}[Battery] UPower unavailable, reading sysfs: "
+                f"{e.message}"
+            )
+            self._start_polling()
+            return
+
+        # Without the daemon running nothing is cached
+        if self._proxy.get_cached_property("Percentage") is None:
+            logger.warning(
+                f"{Colors.WARNING}[Battery] UPower not running, reading sysfs"
+            )
+            self._proxy = None
+            self._start_polling()
+            return
+
+        self._proxy.connect("g-properties-changed", self._sync_upower)
+        self._sync_upower()
+
+    def _sync_upower(self, *_):
+        def get(name: str):
+            value = self._proxy.get_cached_property(name)
+            return value.unpack() if value is not None else 0
+
+        self._update(
+            present=bool(get("IsPresent")),
+            percentage=round(get("Percentage")),
+            charging=get("State") in UPOWER_PLUGGED_STATES,
+            time_to_empty=get("TimeToEmpty"),
+            time_to_full=get("TimeToFull"),
+        )
+
+    def _start_polling(self):
+        self._poll_task = scheduler.add(
+            self.interval, self._sync_sysfs, initial_call=True
+        )
+
+    def _sync_sysfs(self):
+        batteries = glob.glob(os.path.join(POWER_SUPPLY_DIR, "BAT*"))
+        if not batteries:
+            self._update(present=False)
+            return True
+
+        def read(name: str, default: str = "0") -> str:
+            try:
+                with open(os.path.join(batteries[0], name)) as file:
+                    return file.read().strip()
+            except OSError:
+                return default
+
+        status = read("status", "Unknown")
+        # Batteries report either energy (µWh) with power (µW), or charge (µAh)
+        # with current (µA), and the two families must not be mixed
+        if os.path.exists(os.path.join(batteries[0], "energy_now")):
+            unit, rate_file = "energy", "power_now"
+        else:
+            unit, rate_file = "charge", "current_now"
+        now = int(read(f"{unit}_now"))
+        full = int(read(f"{unit}_full"))
+        # Some drivers report the rate as negative while discharging
+        rate = abs(int(read(rate_file)))
+        charging = status in ("Charging", "Full", "Not charging")
+
+        self._update(
+            present=True,
+            percentage=int(read("capacity")),
+            charging=charging,
+            time_to_empty=(
+                now * 3600 // rate if rate and status == "Discharging" else 0
+            ),
+            time_to_full=(
+                (full - now) * 3600 // rate if rate and status == "Charging" else 0
+            ),
+        )
+        return True
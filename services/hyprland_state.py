@@ -0,0 +1,435 @@
+import json
+from functools import partial
+
+from fabric.core.service import Service, Signal
+from fabric.hyprland.widgets import get_hyprland_connection
+from gi.repository import GLib
+from loguru import logger
+
+from utils.colors import Colors
+from utils.hyprland import HyprlandEventBus, get_hyprland_client
+
+# Parts of the state and the requests to hyprland that load them
+STATE_QUERIES = {
+    "monitors": ("monitors",),
+    "workspaces": ("workspaces",),
+    "clients": ("clients", "activewindow"),
+    "devices": ("devices",),
+}
+STATE_KINDS = tuple(STATE_QUERIES)
+
+
+def normalize_address(address: str) -> str:
+    # Events leave out the 0x prefix that j/clients and j/activewindow use
+    return address if address.startswith("0x") else f"0x{address}"
+
+
+class HyprlandState(Service):
+    """Service to keep a copy of hyprland's clients, workspaces, monitors and devices.
+
+    Everything is loaded once and then kept current by applying the events of the
+    event socket, so widgets can query the state without talking to hyprland.
+    Events that can't be applied, or that don't match the copy, trigger a resync
+    of the part of the state they touch.
+    """
+
+    @Signal
+    def changed(self, kind: str) -> None:
+        """Signal emitted when a part of the state, or the active window, changes."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.clients: dict[str, dict] = {}
+        self.workspaces: dict[int, dict] = {}
+        self.monitors: dict[str, dict] = {}
+        self.keyboards: dict[str, dict] = {}
+        self.active_address = ""
+
+        # Addresses of the clients on every workspace, in the order of j/clients
+        self._by_workspace: dict[int, dict[str, None]] = {}
+        self._pending_sync: set[str] = set()
+        self._sync_id = None
+
+        # Events are applied a frame's worth at a time, and every part of the state
+        # they changed is announced once afterwards
+        self._changed: set[str] = set()
+        self._handlers = {
+            "openwindow": self.on_open_window,
+            "closewindow": self.on_close_window,
+            "movewindowv2": self.on_move_window,
+            "windowtitlev2": self.on_window_title,
+            "activewindowv2": self.on_active_window,
+            "changefloatingmode": self.on_floating_mode,
+            "pin": self.on_pin,
+            "fullscreen": self.on_fullscreen,
+            "workspacev2": self.on_workspace,
+            "focusedmonv2": self.on_focused_monitor,
+            "createworkspacev2": self.on_create_workspace,
+            "destroyworkspacev2": self.on_destroy_workspace,
+            "moveworkspacev2": self.on_move_workspace,
+            "renameworkspace": self.on_rename_workspace,
+            "activelayout": self.on_active_layout,
+        }
+        # Grouping hides and shows windows, and monitor changes move workspaces
+        # around, neither of which the events describe well enough to follow
+        for event, kinds in (
+            ("togglegroup", ("clients",)),
+            ("moveintogroup", ("clients",)),
+            ("moveoutofgroup", ("clients",)),
+            ("monitoraddedv2", ("monitors", "workspaces")),
+            ("monitorremoved", ("monitors", "workspaces")),
+            ("configreloaded", ("monitors", "devices")),
+        ):
+            self._handlers[event] = lambda _, kinds=kinds: self.queue_sync(*kinds)
+
+        self.connection = get_hyprland_connection()
+        # Shared with widgets that want hyprland's events themselves, once a frame
+        self.events = HyprlandEventBus(self.connection)
+        self.events.subscribe(self.on_events, *self._handlers)
+
+        if self.connection.ready:
+            self.sync()
+        else:
+            self.connection.connect("event::ready", lambda *_: self.sync())
+
+    # Queries
+
+    def get_client(self, address: str) -> dict | None:
+        return self.clients.get(normalize_address(address))
+
+    @property
+    def active_client(self) -> dict | None:
+        return self.clients.get(self.active_address)
+
+    def clients_on_workspace(self, workspace_id: int) -> list[dict]:
+        return [
+            self.clients[address]
+            for address in self._by_workspace.get(workspace_id, ())
+        ]
+
+    def workspaces_on_monitor(self, monitor: str) -> list[dict]:
+        return [
+            workspace
+            for workspace in self.workspaces.values()
+            if workspace["monitor"] == monitor
+        ]
+
+    def clients_on_monitor(self, monitor: str) -> list[dict]:
+        return [
+            client
+            for workspace in self.workspaces_on_monitor(monitor)
+            for client in self.clients_on_workspace(workspace["id"])
+        ]
+
+    @property
+    def focused_monitor(self) -> dict | None:
+        return next(
+            (monitor for monitor in self.monitors.values() if monitor["focused"]),
+            None,
+        )
+
+    @property
+    def main_keyboard(self) -> dict | None:
+        keyboards = list(self.keyboards.values())
+        if not keyboards:
+            return None
+        return next((kb for kb in keyboards if kb["main"]), keyboards[-1])
+
+    # Syncing
+
+    def query(self, command: str):
+        return json.loads(self.connection.send_command(f"j/{command}").reply)
+
+    def sync(self, *kinds: str):
+        """Reload ``kinds`` (everything by default) from hyprland, blocking."""
+        for kind in kinds or STATE_KINDS:
+            try:
+                replies = [self.query(command) for command in STATE_QUERIES[kind]]
+            except (json.JSONDecodeError, AttributeError) as e:
+                logger.warning(
+                    f"{Colors.WARNING}[HyprlandState] Failed to load {kind}: {e}"
+                )
+                continue
+            self._apply(kind, replies)
+
+    def queue_sync(self, *kinds: str):
+        # Resyncs asked for by a burst of events are done together, once
+        self._pending_sync.update(kinds)
+        if self._sync_id is None:
+            self._sync_id = GLib.idle_add(self._run_sync)
+
+    def _run_sync(self):
+        self._sync_id = None
+        kinds = [kind for kind in STATE_KINDS if kind in self._pending_sync]
+        self._pending_sync = set()
+        logger.debug(f"{Colors.OKBLUE}[HyprlandState] Resyncing {', '.join(kinds)}")
+
+        # Everything in one request, answered without blocking the main loop
+        get_hyprland_client().batch_json(
+            [command for kind in kinds for command in STATE_QUERIES[kind]],
+            partial(self._on_synced, kinds),
+        )
+        return False
+
+    def _on_synced(self, kinds: list[str], replies: list | None):
+        if replies is None:
+            return
+
+        replies = iter(replies)
+        for kind in kinds:
+            self._apply(kind, [next(replies, None) for _ in STATE_QUERIES[kind]])
+
+    def _apply(self, kind: str, replies: list):
+        try:
+            match kind:
+                case "clients":
+                    clients, active_window = replies
+                    self._set_clients(clients)
+                    self.active_address = active_window.get("address", "")
+                case "workspaces":
+                    self.workspaces = {
+                        workspace["id"]: workspace for workspace in replies[0]
+                    }
+                case "monitors":
+                    self.monitors = {monitor["name"]: monitor for monitor in replies[0]}
+                case "devices":
+                    self.keyboards = {
+                        keyboard["name"]: keyboard
+                        for keyboard in replies[0]["keyboards"]
+                    }
+        except (AttributeError, KeyError, TypeError) as e:
+            logger.warning(
+                f"{Colors.WARNING}[HyprlandState] Failed to load {kind}: {e}"
+            )
+            return
+
+        self.emit("changed", kind)
+
+    def _set_clients(self, clients: list[dict]):
+        self.clients = {}
+        self._by_workspace = {}
+        for client in clients:
+            self._add_client(client)
+
+    def _add_client(self, client: dict):
+        self.clients[client["address"]] = client
+        self._by_workspace.setdefault(client["workspace"]["id"], {})[
+            client["address"]
+        ] = None
+
+    def _remove_client(self, address: str) -> dict | None:
+        client = self.clients.pop(address, None)
+        if client is not None:
+            self._by_workspace.get(client["workspace"]["id"], {}).pop(address, None)
+        return client
+
+    def _find_client(self, address: str) -> dict | None:
+        client = self.clients.get(normalize_address(address))
+        if client is None:
+            # An event about a window we don't know of, so the copy drifted
+            self.queue_sync("clients")
+        return client
+
+    def _find_workspace(self, name: str) -> dict | None:
+        return next(
+            (
+                workspace
+                for workspace in self.workspaces.values()
+                if workspace["name"] == name
+            ),
+            None,
+        )
+
+    def on_events(self, events: list[tuple[str, list[str]]]):
+        for name, data in events:
+            self._handlers[name](data)
+
+        changed, self._changed = self._changed, set()
+        for kind in ("monitors", "workspaces", "clients", "active", "devices"):
+            if kind in changed:
+                self.emit("changed", kind)
+
+    # Window events
+
+    def on_open_window(self, data: list[str]):
+        # ADDRESS,WORKSPACENAME,CLASS,TITLE where the title may contain commas
+        address, workspace_name, window_class = data[:3]
+        address = normalize_address(address)
+
+        workspace = self._find_workspace(workspace_name)
+        if workspace is None or address in self.clients:
+            self.queue_sync("workspaces", "clients")
+            return
+
+        self._add_client(
+            {
+                "address": address,
+                "mapped": True,
+                "hidden": False,
+                "workspace": {"id": workspace["id"], "name": workspace["name"]},
+                "monitor": workspace["monitorID"],
+                "floating": False,
+                "pinned": False,
+                "fullscreen": 0,
+                "class": window_class,
+                "title": ",".join(data[3:]),
+                "initialClass": window_class,
+                "initialTitle": ",".join(data[3:]),
+            }
+        )
+        self._changed.add("clients")
+
+    def on_close_window(self, data: list[str]):
+        address = normalize_address(data[0])
+        if self._remove_client(address) is None:
+            self.queue_sync("clients")
+            return
+
+        if address == self.active_address:
+            self.active_address = ""
+        self._changed.add("clients")
+
+    def on_move_window(self, data: list[str]):
+        # ADDRESS,WORKSPACEID,WORKSPACENAME
+        client = self._find_client(data[0])
+        workspace = self.workspaces.get(int(data[1]))
+        if client is None:
+            return
+        if workspace is None:
+            self.queue_sync("workspaces", "clients")
+            return
+
+        # Moved in the workspace index only, clients keep their order
+        self._by_workspace.get(client["workspace"]["id"], {}).pop(
+            client["address"], None
+        )
+        self._by_workspace.setdefault(workspace["id"], {})[client["address"]] = None
+        client["workspace"] = {"id": workspace["id"], "name": workspace["name"]}
+        client["monitor"] = workspace["monitorID"]
+        self._changed.add("clients")
+
+    def on_window_title(self, data: list[str]):
+        client = self._find_client(data[0])
+        if client is not None:
+            client["title"] = ",".join(data[1:])
+            self._changed.add("clients")
+
+    def on_active_window(self, data: list[str]):
+        address = data[0]
+        self.active_address = normalize_address(address) if address else ""
+        if address and self.active_address not in self.clients:
+            self.queue_sync("clients")
+            return
+        self._changed.add("active")
+
+    def on_floating_mode(self, data: list[str]):
+        client = self._find_client(data[0])
+        if client is not None:
+            client["floating"] = data[1] == "1"
+            self._changed.add("clients")
+
+    def on_pin(self, data: list[str]):
+        client = self._find_client(data[0])
+        if client is not None:
+            client["pinned"] = data[1] == "1"
+            self._changed.add("clients")
+
+    def on_fullscreen(self, data: list[str]):
+        # Only says whether the active window went fullscreen, not whether it was
+        # maximized (1) or really fullscreen (2), so the mode is loaded again
+        client = self.active_client
+        if client is None:
+            return
+
+        if data[0] == "0":
+            client["fullscreen"] = 0
+            self._changed.add("clients")
+        else:
+            self.queue_sync("clients")
+
+    # Workspace and monitor events
+
+    def on_workspace(self, data: list[str]):
+        workspace = self.workspaces.get(int(data[0]))
+        monitor = workspace and self.monitors.get(workspace["monitor"])
+        if monitor is None:
+            self.queue_sync("workspaces", "monitors")
+            return
+
+        monitor["activeWorkspace"] = {"id": workspace["id"], "name": workspace["name"]}
+        self._changed.add("monitors")
+
+    def on_focused_monitor(self, data: list[str]):
+        # MONITORNAME,WORKSPACEID
+        if data[0] not in self.monitors:
+            self.queue_sync("monitors")
+            return
+
+        for name, monitor in self.monitors.items():
+            monitor["focused"] = name == data[0]
+        self._changed.add("monitors")
+
+    def on_create_workspace(self, data: list[str]):
+        # New workspaces show up on the focused monitor, unless a rule moves
+        # them, which is then followed by a moveworkspacev2 event
+        monitor = self.focused_monitor
+        if monitor is None:
+            self.queue_sync("workspaces", "monitors")
+            return
+
+        workspace_id = int(data[0])
+        self.workspaces[workspace_id] = {
+            "id": workspace_id,
+            "name": ",".join(data[1:]),
+            "monitor": monitor["name"],
+            "monitorID": monitor["id"],
+            "windows": 0,
+            "hasfullscreen": False,
+        }
+        self._changed.add("workspaces")
+
+    def on_destroy_workspace(self, data: list[str]):
+        workspace_id = int(data[0])
+        if self.workspaces.pop(workspace_id, None) is None:
+            self.queue_sync("workspaces")
+            return
+
+        self._by_workspace.pop(workspace_id, None)
+        self._changed.add("workspaces")
+
+    def on_move_workspace(self, data: list[str]):
+        # WORKSPACEID,WORKSPACENAME,MONITORNAME
+        workspace = self.workspaces.get(int(data[0]))
+        monitor = self.monitors.get(data[-1])
+        if workspace is None or monitor is None:
+            self.queue_sync("workspaces", "monitors")
+            return
+
+        workspace["monitor"] = monitor["name"]
+        workspace["monitorID"] = monitor["id"]
+        for client in self.clients_on_workspace(workspace["id"]):
+            client["monitor"] = monitor["id"]
+        self._changed.add("workspaces")
+
+    def on_rename_workspace(self, data: list[str]):
+        workspace = self.workspaces.get(int(data[0]))
+        if workspace is None:
+            self.queue_sync("workspaces")
+            return
+
+        workspace["name"] = ",".join(data[1:])
+        for client in self.clients_on_workspace(workspace["id"]):
+            client["workspace"]["name"] = workspace["name"]
+        self._changed.add("workspaces")
+
+    # Device events
+
+    def on_active_layout(self, data: list[str]):
+        # KEYBOARDNAME,LAYOUTNAME where layout names often contain commas
+        keyboard = self.keyboards.get(data[0])
+        if keyboard is None:
+            self.queue_sync("devices")
+            return
+
+        keyboard["active_keymap"] = ",".join(data[1:])
+        self._changed.add("devices")
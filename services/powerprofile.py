@@ -1,17 +1,104 @@
-import dbus
+from fabric.core.service import Property, Service
+from gi.repository import Gio, GLib
+from loguru import logger
 
-# Connect to the system bus
-bus = dbus.SystemBus()
+from utils.colors import Colors
+from utils.scheduler import scheduler
 
-# Get the PowerProfiles object
-power_profiles = bus.get_object(
-    "org.freedesktop.UPower.PowerProfiles", "/org/freedesktop/UPower/PowerProfiles"
+POWER_PROFILES_BUS = (
+    "org.freedesktop.UPower.PowerProfiles",
+    "/org/freedesktop/UPower/PowerProfiles",
+    "org.freedesktop.UPower.PowerProfiles",
+)
+UPOWER_BUS = (
+    "org.freedesktop.UPower",
+    "/org/freedesktop/UPower",
+    "org.freedesktop.UPower",
 )
 
-# Get the Properties interface for this object
-properties_interface = dbus.Interface(power_profiles, "org.freedesktop.DBus.Properties")
 
-# Access the ActiveProfile property correctly using the 'Get' method
-active_profile = properties_interface.Get(
-    "org.freedesktop.UPower.PowerProfiles", "ActiveProfile"
-)
+class PowerProfiles(Service):
+    """Service to follow the active power profile and whether we run on battery."""
+
+    @Property(str, "readable")
+    def active_profile(self) -> str:
+        return self._active_profile
+
+    @Property(bool, "readable", default_value=False)
+    def on_battery(self) -> bool:
+        return self._on_battery
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._active_profile = "balanced"
+        self._on_battery = False
+        # Kept around so the proxies, and their signal handlers, stay alive
+        self._proxies: dict[str, Gio.DBusProxy] = {}
+
+        self._watch(POWER_PROFILES_BUS, "ActiveProfile", "active-profile")
+        self._watch(UPOWER_BUS, "OnBattery", "on-battery")
+
+    def _watch(self, bus: tuple[str, str, str], name: str, prop: str):
+        def on_proxy_ready(_, result):
+            try:
+                proxy = Gio.DBusProxy.new_for_bus_finish(result)
+            except GLib.Error as e:
+                logger.warning(
+                    f"{Colors.WARNING}[PowerProfiles] {bus[0]} unavailable: {e.message}"
+                )
+                return
+
+            self._proxies[name] = proxy
+            proxy.connect("g-properties-changed", on_properties_changed)
+            self._sync(proxy, name, prop)
+
+        def on_properties_changed(proxy, changed: GLib.Variant, *_):
+            if name in changed.unpack():
+                self._sync(proxy, name, prop)
+
+        Gio.DBusProxy.new_for_bus(
+            Gio.BusType.SYSTEM,
+            Gio.DBusProxyFlags.NONE,
+            None,
+            *bus,
+            None,
+            on_proxy_ready,
+        )
+
+    def _sync(self, proxy: Gio.DBusProxy, name: str, prop: str):
+        value = proxy.get_cached_property(name)
+        # Not cached when the daemon is not running
+        if value is None:
+            return
+
+        setattr(self, f"_{prop.replace('-', '_')}", value.unpack())
+        self.notify(prop)
+
+
+class PollingPolicy:
+    """Class to slow down every poller on battery and in the power-saver profile."""
+
+    def __init__(self, power_profiles: PowerProfiles, config: dict):
+        self.power_profiles = power_profiles
+        self.config = config
+
+        power_profiles.connect("notify::active-profile", self.apply)
+        power_profiles.connect("notify::on-battery", self.apply)
+        self.apply()
+
+    def get_scale(self) -> float:
+        scale = 1.0
+        if self.power_profiles.on_battery:
+            scale *= self.config["battery_multiplier"]
+        scale *= self.config["profile_multipliers"].get(
+            self.power_profiles.active_profile, 1.0
+        )
+        return scale
+
+    def apply(self, *_):
+        scale = self.get_scale()
+        if scale != scheduler.scale:
+            logger.info(
+                f"{Colors.OKBLUE}[PowerProfiles] Scaling polling intervals by {scale}"
+            )
+        scheduler.set_scale(scale)
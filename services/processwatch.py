@@ -0,0 +1,118 @@
+import os
+
+from fabric.core.service import Service, Signal
+from gi.repository import GLib
+from loguru import logger
+
+from utils.colors import Colors
+from utils.procfs import PROC_DIR
+from utils.scheduler import scheduler
+
+# The kernel truncates process names in /proc/<pid>/comm to 15 characters
+COMM_LENGTH = 15
+
+
+class ProcessWatcher(Service):
+    """Service to track whether named processes run, shared by every switcher.
+
+    Starts are picked up by a single /proc scan per tick. Once a process is found
+    its exit is reported through a pidfd, so running processes are not polled.
+    """
+
+    @Signal
+    def changed(self, name: str, running: bool) -> None:
+        """Signal emitted when a watched process starts or stops."""
+
+    def __init__(self, proc_dir: str = PROC_DIR, **kwargs):
+        super().__init__(**kwargs)
+        self.proc_dir = proc_dir
+
+        # Watched names mapped to the pid running them, or None when not running
+        self._pids: dict[str, int | None] = {}
+        # Exit watches on the pidfds of running processes, keyed by name
+        self._pidfds: dict[str, tuple[int, int]] = {}
+        self._intervals: list[int] = []
+        self._task = None
+
+    def watch(self, name: str, interval: int = 2000) -> bool:
+        """Track ``name`` and check for it at least every ``interval`` ms."""
+        self._pids.setdefault(name, None)
+        self._intervals.append(interval)
+
+        if min(self._intervals) == interval:
+            scheduler.remove(self._task)
+            self._task = scheduler.add(interval, self.refresh, initial_call=False)
+
+        self.refresh()
+        return self.is_running(name)
+
+    def is_running(self, name: str) -> bool:
+        return self._pids.get(name) is not None
+
+    def refresh(self) -> bool:
+        # Processes with an exit watch report their own exit, no need to look
+        missing = {
+            name[:COMM_LENGTH]: name
+            for name in self._pids
+            if name not in self._pidfds
+        }
+        if not missing:
+            return True
+
+        found = self.scan(missing)
+        for name in missing.values():
+            self._set_pid(name, found.get(name))
+        return True
+
+    def scan(self, names: dict[str, str]) -> dict[str, int]:
+        """Find the pids of the processes whose comm matches ``names``."""
+        found = {}
+        with os.scandir(self.proc_dir) as entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    with open(os.path.join(entry.path, "comm"), "rb") as file:
+                        comm = file.read().rstrip(b"\n").decode(errors="replace")
+                except OSError:
+                    # The process exited while scanning
+                    continue
+
+                name = names.get(comm)
+                if name is not None and name not in found:
+                    found[name] = int(entry.name)
+                    if len(found) == len(names):
+                        break
+        return found
+
+    def _set_pid(self, name: str, pid: int | None):
+        was_running = self.is_running(name)
+        self._pids[name] = pid
+
+        if pid is not None and name not in self._pidfds:
+            self._watch_exit(name, pid)
+
+        if was_running != (pid is not None):
+            self.emit("changed", name, pid is not None)
+
+    def _watch_exit(self, name: str, pid: int):
+        try:
+            pidfd = os.pidfd_open(pid)
+        except (AttributeError, OSError) as e:
+            # Without pidfd support the process keeps being polled
+            logger.debug(f"{Colors.WARNING}[ProcessWatcher] No pidfd for {name}: {e}")
+            return
+
+        def on_exit(*_):
+            del self._pidfds[name]
+            os.close(pidfd)
+            self._set_pid(name, None)
+            # Another instance may still be running
+            self.refresh()
+            return False
+
+        # A pidfd becomes readable once the process exits
+        source_id = GLib.unix_fd_add_full(
+            GLib.PRIORITY_DEFAULT, pidfd, GLib.IOCondition.IN, on_exit
+        )
+        self._pidfds[name] = (pidfd, source_id)
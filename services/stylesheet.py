@@ -0,0 +1,506 @@
+import contextlib
+import os
+import re
+import time
+
+from fabric.core.service import Property, Service, Signal
+from gi.repository import Gdk, Gio, GLib, Gtk
+from loguru import logger
+
+from utils.colors import Colors
+from utils.profiler import profiler
+from utils.stylesheet import (
+    MAIN_CSS,
+    MAIN_SCSS,
+    PALETTE_SCSS,
+    SASS_ARGS,
+    compile_scss,
+    compile_theme,
+    get_sass_command,
+    get_theme_css,
+    get_theme_load_path,
+    hash_scss_sources,
+    is_css_fresh,
+    read_hash_stamp,
+    resolve_theme,
+    write_hash_stamp,
+)
+
+# Sass prints "Compiled <entry> to <output>." after every successful build
+SASS_COMPILED_RE = re.compile(r"Compiled (.+) to (.+?)\.?$")
+
+
+class SassWatcher(Service):
+    """Service to keep a single sass process alive that recompiles on changes."""
+
+    @Signal
+    def compiled(self, css_file: str) -> None:
+        """Signal emitted every time the watcher finishes a compile."""
+
+    @Signal
+    def stopped(self) -> None:
+        """Signal emitted when the watcher crashed too often and gave up."""
+
+    @Property(bool, "readable", default_value=False)
+    def running(self) -> bool:
+        return self._process is not None
+
+    def __init__(
+        self,
+        targets: list[tuple[str, str]],
+        load_paths: tuple[str, ...] = (),
+        max_restarts: int = 3,
+        restart_delay: int = 1000,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        # Pairs of scss entry points and the css they compile to
+        self.targets = targets
+        self.load_paths = load_paths
+        self.max_restarts = max_restarts
+        self.restart_delay = restart_delay
+
+        self._process: Gio.Subprocess | None = None
+        self._cancellable: Gio.Cancellable | None = None
+        self._restarts = 0
+        self._restart_id = None
+
+    def start(self) -> bool:
+        if self._process:
+            return True
+
+        try:
+            # --update skips the initial compile when the css is already up to date
+            self._process = Gio.Subprocess.new(
+                [
+                    "sass",
+                    "--watch",
+                    "--update",
+                    "--no-error-css",
+                    *(f"--load-path={path}" for path in self.load_paths),
+                    *SASS_ARGS,
+                    *(f"{entry}:{output}" for entry, output in self.targets),
+                ],
+                Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_PIPE,
+            )
+        except GLib.Error as e:
+            logger.error(f"{Colors.FAIL}[CSS] Failed to start sass: {e.message}")
+            self._process = None
+            return False
+
+        self._cancellable = Gio.Cancellable()
+        self._read_lines(self._process.get_stdout_pipe(), self._on_stdout_line)
+        self._read_lines(self._process.get_stderr_pipe(), self._on_stderr_line)
+        self._process.wait_async(self._cancellable, self._on_process_exit)
+        self.notify("running")
+
+        logger.info(f"{Colors.OKBLUE}[CSS] Sass watcher started")
+        return True
+
+    def stop(self):
+        self._restarts = 0
+        if self._restart_id:
+            GLib.source_remove(self._restart_id)
+            self._restart_id = None
+        if self._cancellable:
+            self._cancellable.cancel()
+            self._cancellable = None
+        if self._process:
+            self._process.force_exit()
+            self._process = None
+            self.notify("running")
+
+    def _read_lines(self, pipe: Gio.InputStream, callback):
+        stream = Gio.DataInputStream(base_stream=pipe)
+
+        def on_line(stream: Gio.DataInputStream, result):
+            try:
+                line, _ = stream.read_line_finish_utf8(result)
+            except GLib.Error:
+                return
+            # None means the process closed the pipe
+            if line is None:
+                return
+            callback(line)
+            stream.read_line_async(GLib.PRIORITY_DEFAULT, self._cancellable, on_line)
+
+        stream.read_line_async(GLib.PRIORITY_DEFAULT, self._cancellable, on_line)
+
+    def _on_stdout_line(self, line: str):
+        match = SASS_COMPILED_RE.search(line)
+        if not match:
+            return
+
+        self._restarts = 0
+        compiled_file = os.path.abspath(match.group(2))
+
+        # Should the output ever be unrecognizable, treat every target as rebuilt
+        targets = [
+            target
+            for target in self.targets
+            if os.path.abspath(target[1]) == compiled_file
+        ] or self.targets
+
+        for entry, output in targets:
+            with contextlib.suppress(OSError):
+                write_hash_stamp(output, hash_scss_sources(entry, self.load_paths))
+            self.emit("compiled", output)
+
+    def _on_stderr_line(self, line: str):
+        if line.strip():
+            logger.error(f"{Colors.FAIL}[CSS] {line}")
+
+    def _on_process_exit(self, process: Gio.Subprocess, result):
+        try:
+            process.wait_finish(result)
+        except GLib.Error:
+            # Waiting was cancelled because the watcher was stopped on purpose
+            return
+
+        self._process = None
+        self._cancellable = None
+        self.notify("running")
+
+        if self._restarts >= self.max_restarts:
+            logger.warning(
+                f"{Colors.WARNING}[CSS] Sass watcher keeps exiting, "
+                "falling back to one-shot compiles"
+            )
+            self.emit("stopped")
+            return
+
+        # Back off a little more after every crash
+        delay = self.restart_delay * 2**self._restarts
+        self._restarts += 1
+        logger.warning(
+            f"{Colors.WARNING}[CSS] Sass watcher exited, restarting in {delay} ms"
+        )
+        self._restart_id = GLib.timeout_add(delay, self._on_restart_timeout)
+
+    def _on_restart_timeout(self):
+        self._restart_id = None
+        if not self.start():
+            self.emit("stopped")
+        return False
+
+
+class StylesheetBuilder(Service):
+    """Service to rebuild the stylesheet in the background when the scss changes."""
+
+    @Signal
+    def compiled(self, css_file: str) -> None:
+        """Signal emitted with the path of the freshly compiled css."""
+
+    @Signal
+    def failed(self, error: str) -> None:
+        """Signal emitted when sass fails to compile the stylesheet."""
+
+    def __init__(
+        self,
+        theme: str | None = None,
+        debounce: int = 150,
+        persistent: bool = True,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        # Theme whose palette is rebuilt along with the layout
+        self.theme = theme
+        self.debounce = debounce
+        self.persistent = persistent
+
+        self._debounce_id = None
+        # Builds in flight, keyed by the css file they produce
+        self._builds: dict[str, tuple[int, Gio.Subprocess, Gio.Cancellable]] = {}
+        # Incremented on every build so results of superseded builds are dropped
+        self._generation = 0
+        # When the last change was noticed, used to log the rebuild latency
+        self._requested_at: float | None = None
+
+        # The layout is shared by every theme, so a single long-lived sass keeps
+        # it up to date for the whole session and theme switches never touch it
+        self.watcher = SassWatcher(targets=[(MAIN_SCSS, MAIN_CSS)])
+        self.watcher.connect("compiled", lambda _, css_file: self._emit(css_file))
+        # Catch up on whatever changed while the watcher was down
+        self.watcher.connect("stopped", self.queue_rebuild)
+
+        if not (self.persistent and self.watcher.start()):
+            self.rebuild()
+
+    def _emit(self, css_file: str):
+        if self._requested_at is not None:
+            logger.info(
+                f"{Colors.OKBLUE}[CSS] Rebuilt in "
+                f"{(time.perf_counter() - self._requested_at) * 1000:.1f} ms"
+            )
+            self._requested_at = None
+        self.emit("compiled", css_file)
+
+    def queue_rebuild(self, *_):
+        if self._requested_at is None:
+            self._requested_at = time.perf_counter()
+
+        # Editors emit several events per save, only build once they settle down
+        if self._debounce_id:
+            GLib.source_remove(self._debounce_id)
+        self._debounce_id = GLib.timeout_add(self.debounce, self._on_debounce_done)
+
+    def _on_debounce_done(self):
+        self._debounce_id = None
+        self.rebuild()
+        return False
+
+    def cancel(self, output: str | None = None):
+        outputs = [output] if output else list(self._builds)
+        for output in outputs:
+            build = self._builds.pop(output, None)
+            if build:
+                _, process, cancellable = build
+                cancellable.cancel()
+                process.force_exit()
+
+    def stop(self):
+        """Stop the sass watcher and every build still running."""
+        if self._debounce_id:
+            GLib.source_remove(self._debounce_id)
+            self._debounce_id = None
+        self.cancel()
+        self.watcher.stop()
+
+    def rebuild(self):
+        # The watcher notices changes to the layout on its own
+        if not self.watcher.running:
+            self._compile(MAIN_SCSS, MAIN_CSS)
+
+        if self.theme:
+            self.compile_palette(self.theme)
+
+    def compile_palette(self, theme: str, source_hash: str | None = None):
+        """Compile the palette of a theme unless it is already up to date."""
+        self._compile(
+            PALETTE_SCSS,
+            get_theme_css(theme),
+            (get_theme_load_path(theme),),
+            source_hash,
+        )
+
+    def _compile(
+        self,
+        entry: str,
+        output: str,
+        load_paths: tuple[str, ...] = (),
+        source_hash: str | None = None,
+    ):
+        if source_hash is None:
+            try:
+                source_hash = hash_scss_sources(entry, load_paths)
+            except OSError as e:
+                # Files can briefly disappear while an editor saves them
+                logger.warning(f"{Colors.WARNING}[CSS] Unable to read sources: {e}")
+                return
+
+        # Nothing to apply when the sources hash to the css already in use
+        if is_css_fresh(output, source_hash):
+            return
+
+        # A newer build of the same css always supersedes the one in flight
+        self.cancel(output)
+        self._generation += 1
+
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+
+        # Compile into a temporary file so a cancelled build never leaves half a css
+        build_output = f"{output}.{self._generation}.tmp"
+
+        try:
+            process = Gio.Subprocess.new(
+                get_sass_command(entry, build_output, load_paths),
+                Gio.SubprocessFlags.STDOUT_SILENCE | Gio.SubprocessFlags.STDERR_PIPE,
+            )
+        except GLib.Error as e:
+            logger.error(f"{Colors.FAIL}[CSS] Failed to start sass: {e.message}")
+            self.emit("failed", e.message)
+            return
+
+        cancellable = Gio.Cancellable()
+        self._builds[output] = (self._generation, process, cancellable)
+        process.communicate_utf8_async(
+            None,
+            cancellable,
+            self._on_process_done,
+            (self._generation, output, build_output, source_hash),
+        )
+
+    def _on_process_done(self, process: Gio.Subprocess, result, data):
+        generation, output, build_output, source_hash = data
+
+        try:
+            _, _, stderr = process.communicate_utf8_finish(result)
+        except GLib.Error:
+            # The build was cancelled because a newer one superseded it
+            return self._remove_build_output(build_output)
+
+        build = self._builds.get(output)
+        if build is None or build[0] != generation:
+            return self._remove_build_output(build_output)
+
+        self._builds.pop(output)
+
+        if process.get_exit_status() != 0:
+            self._remove_build_output(build_output)
+            logger.error(f"{Colors.FAIL}[CSS] Failed to compile: {stderr.strip()}")
+            self.emit("failed", stderr.strip())
+            return
+
+        os.replace(build_output, output)
+        write_hash_stamp(output, source_hash)
+        self._emit(output)
+
+    def _remove_build_output(self, build_output: str):
+        if os.path.exists(build_output):
+            os.remove(build_output)
+
+
+class ThemeManager(Service):
+    """Service to apply the stylesheet and swap the theme palette on top of it."""
+
+    @Signal
+    def changed(self, theme: str) -> None:
+        """Signal emitted once the palette of a theme has been applied."""
+
+    @Property(str, "readable")
+    def theme(self) -> str:
+        return self._theme
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._theme = None
+        self._builder: StylesheetBuilder | None = None
+
+        # The layout and the palette live in separate providers, so a theme
+        # change only replaces the few @define-color rules of the palette
+        self._layers: dict[str, Gtk.CssProvider] = {}
+
+        # Parsed palettes kept in memory with the hash of their sources
+        self._palettes: dict[str, tuple[str, Gtk.CssProvider]] = {}
+        # Hashes of the palette sources, dropped whenever the styles change
+        self._hashes: dict[str, str] = {}
+
+    def set_theme(self, theme: str):
+        theme = resolve_theme(theme)
+        source_hash = self._get_source_hash(theme)
+        css_file = get_theme_css(theme)
+
+        # Block on the very first theme so the bar never shows up unstyled
+        first_run = "palette" not in self._layers
+        cached = self._palettes.get(theme)
+
+        if cached and cached[0] == source_hash:
+            provider = cached[1]
+        elif is_css_fresh(css_file, source_hash):
+            provider = self._load_palette(theme, css_file, source_hash)
+        elif first_run:
+            with profiler.measure("compile: palette", "css"):
+                compiled = compile_theme(theme)
+            provider = compiled and self._load_palette(theme, css_file, source_hash)
+        else:
+            # Compiled in the background and applied from on_compiled
+            provider = None
+
+        self._theme = theme
+        self.notify("theme")
+
+        if provider:
+            self._apply_layer("palette", provider)
+
+        if first_run:
+            with profiler.measure("compile: layout", "css"):
+                compiled = compile_scss(MAIN_SCSS, MAIN_CSS)
+            if compiled:
+                self._apply_layer("layout", self._load_css(MAIN_CSS))
+
+        if self._builder is None:
+            self._builder = StylesheetBuilder(theme=theme)
+            self._builder.connect("compiled", self.on_compiled)
+            return
+
+        self._builder.theme = theme
+        if provider is None:
+            self._builder.compile_palette(theme, source_hash)
+
+    def stop(self):
+        """Stop the sass processes, the applied stylesheet stays as it is."""
+        if self._builder:
+            self._builder.stop()
+
+    def queue_rebuild(self, *_):
+        # Any source may have changed, so every palette is hashed again on use
+        self._hashes.clear()
+        if self._builder:
+            self._builder.queue_rebuild()
+
+    def on_compiled(self, _, css_file: str):
+        if css_file == MAIN_CSS:
+            self._apply_layer("layout", self._load_css(MAIN_CSS))
+            return
+
+        theme = os.path.basename(css_file).removesuffix(".css")
+        source_hash = read_hash_stamp(css_file)
+        if source_hash is None:
+            return
+
+        self._hashes[theme] = source_hash
+        provider = self._load_palette(theme, css_file, source_hash)
+
+        # Palettes of a theme switched away from in the meantime are only cached
+        if theme == self._theme:
+            self._apply_layer("palette", provider)
+
+    def _get_source_hash(self, theme: str) -> str:
+        if theme not in self._hashes:
+            self._hashes[theme] = hash_scss_sources(
+                PALETTE_SCSS, (get_theme_load_path(theme),)
+            )
+        return self._hashes[theme]
+
+    def _load_css(self, css_file: str) -> Gtk.CssProvider | None:
+        provider = Gtk.CssProvider()
+        try:
+            provider.load_from_path(css_file)
+        except GLib.Error as e:
+            logger.error(f"{Colors.FAIL}[THEME] Failed to load {css_file}: {e.message}")
+            return None
+        return provider
+
+    def _load_palette(
+        self, theme: str, css_file: str, source_hash: str
+    ) -> Gtk.CssProvider | None:
+        provider = self._load_css(css_file)
+        if provider:
+            self._palettes[theme] = (source_hash, provider)
+        return provider
+
+    def _apply_layer(self, layer: str, provider: Gtk.CssProvider | None):
+        current = self._layers.get(layer)
+
+        if provider is None or current is provider:
+            return
+
+        start = time.perf_counter()
+        screen = Gdk.Screen.get_default()
+
+        if current:
+            Gtk.StyleContext.remove_provider_for_screen(screen, current)
+
+        Gtk.StyleContext.add_provider_for_screen(
+            screen, provider, Gtk.STYLE_PROVIDER_PRIORITY_USER
+        )
+        self._layers[layer] = provider
+
+        logger.info(
+            f"{Colors.OKBLUE}[THEME] Swapped the {layer} stylesheet "
+            f"({(time.perf_counter() - start) * 1000:.1f} ms)"
+        )
+
+        if layer == "palette":
+            logger.info(f"{Colors.OKBLUE}[THEME] '{self._theme}' applied successfully.")
+            self.emit("changed", self._theme)
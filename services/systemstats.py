@@ -0,0 +1,222 @@
+import time
+from typing import NamedTuple
+
+import psutil
+from fabric.core.service import Service, Signal
+from loguru import logger
+
+from utils.colors import Colors
+from utils.procfs import PROC_DIR, CpuReader, MemoryReader
+from utils.ringbuffer import RingBuffer
+from utils.scheduler import scheduler
+
+
+class CpuStats(NamedTuple):
+    """Snapshot of the cpu usage."""
+
+    percent: float
+    per_core: tuple[float, ...]
+
+
+class MemoryStats(NamedTuple):
+    """Snapshot of the memory and swap usage, sizes are in bytes."""
+
+    used: int
+    total: int
+    percent: float
+    swap_used: int
+    swap_total: int
+    swap_percent: float
+
+
+class StorageStats(NamedTuple):
+    """Snapshot of the usage of a disk, sizes are in bytes."""
+
+    path: str
+    used: int
+    total: int
+    percent: float
+
+
+class SystemStats(Service):
+    """Service to sample system usage once per tick for every widget showing it."""
+
+    @Signal
+    def cpu(self, stats: object) -> None:
+        """Signal emitted with a CpuStats snapshot."""
+
+    @Signal
+    def memory(self, stats: object) -> None:
+        """Signal emitted with a MemoryStats snapshot."""
+
+    @Signal
+    def storage(self, stats: object) -> None:
+        """Signal emitted with a StorageStats snapshot."""
+
+    def __init__(
+        self,
+        storage_path: str = "/",
+        proc_dir: str | None = PROC_DIR,
+        history_size: int = 300,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.storage_path = storage_path
+        self.history_size = history_size
+
+        # Reading /proc directly avoids reopening files on every sample, psutil
+        # is used when it is unavailable or proc_dir is None
+        self.cpu_reader: CpuReader | None = None
+        self.memory_reader: MemoryReader | None = None
+        if proc_dir:
+            try:
+                self.cpu_reader = CpuReader(proc_dir)
+                self.memory_reader = MemoryReader(proc_dir)
+            except (OSError, ValueError, IndexError) as e:
+                logger.warning(
+                    f"{Colors.WARNING}[SystemStats] Falling back to psutil: {e}"
+                )
+                self.cpu_reader = self.memory_reader = None
+
+        # Intervals requested for each metric, only watched metrics are sampled
+        self._intervals: dict[str, list[int]] = {
+            "cpu": [],
+            "memory": [],
+            "storage": [],
+        }
+        # Scheduler task of every watched metric, with the interval it runs at
+        self._tasks: dict[str, tuple[int, int]] = {}
+
+        # Last snapshot of every metric, handed to widgets as soon as they watch it
+        self.snapshots: dict[str, NamedTuple] = {}
+
+        # Percentages of the last samples, fixed in size for long running sessions
+        self.history = {
+            metric: RingBuffer(history_size)
+            for metric in ("cpu", "memory", "swap", "storage")
+        }
+        self.core_history: list[RingBuffer] = []
+
+        # Usage of every mounted disk, sampled on demand and reused for a while
+        self._mounts: list[StorageStats] = []
+        self._mounts_sampled_at: float | None = None
+
+        # The first call only primes psutil's counters and always reports 0
+        if not self.cpu_reader:
+            psutil.cpu_percent(percpu=True)
+
+    def watch(self, metric: str, interval: int):
+        """Start sampling ``metric`` at least every ``interval`` milliseconds."""
+        if metric not in self._intervals:
+            raise ValueError(f"Unknown metric '{metric}'")
+
+        self._intervals[metric].append(interval)
+
+        if metric not in self.snapshots:
+            self._update(metric)
+        else:
+            self.emit(metric, self.snapshots[metric])
+
+        self._reschedule(metric)
+
+    def unwatch(self, metric: str, interval: int):
+        self._intervals[metric].remove(interval)
+        if not self._intervals[metric]:
+            self.snapshots.pop(metric, None)
+        self._reschedule(metric)
+
+    def sample(self, metric: str) -> NamedTuple:
+        match metric:
+            case "cpu":
+                if self.cpu_reader:
+                    return CpuStats(*self.cpu_reader.usage())
+                per_core = tuple(psutil.cpu_percent(percpu=True))
+                return CpuStats(
+                    percent=round(sum(per_core) / len(per_core), 1),
+                    per_core=per_core,
+                )
+            case "memory":
+                if self.memory_reader:
+                    return MemoryStats(*self.memory_reader.usage())
+                memory = psutil.virtual_memory()
+                swap = psutil.swap_memory()
+                return MemoryStats(
+                    used=memory.used,
+                    total=memory.total,
+                    percent=memory.percent,
+                    swap_used=swap.used,
+                    swap_total=swap.total,
+                    swap_percent=swap.percent,
+                )
+            case "storage":
+                disk = psutil.disk_usage(self.storage_path)
+                return StorageStats(
+                    path=self.storage_path,
+                    used=disk.used,
+                    total=disk.total,
+                    percent=disk.percent,
+                )
+
+    def sample_mounts(self, max_age: float = 5.0) -> list[StorageStats]:
+        """Sample the usage of every mounted disk, at most every ``max_age`` s."""
+        now = time.monotonic()
+        if (
+            self._mounts_sampled_at is not None
+            and now - self._mounts_sampled_at < max_age
+        ):
+            return self._mounts
+
+        mounts = []
+        for partition in psutil.disk_partitions():
+            try:
+                disk = psutil.disk_usage(partition.mountpoint)
+            except OSError:
+                continue
+            mounts.append(
+                StorageStats(
+                    path=partition.mountpoint,
+                    used=disk.used,
+                    total=disk.total,
+                    percent=disk.percent,
+                )
+            )
+
+        self._mounts = mounts
+        self._mounts_sampled_at = now
+        return mounts
+
+    def _reschedule(self, metric: str):
+        # Each metric runs at the shortest interval asked for it, the scheduler
+        # still wakes up once for all the metrics that fall due together
+        interval = min(self._intervals[metric], default=0)
+        task = self._tasks.get(metric)
+        if task and task[0] == interval:
+            return
+
+        if task:
+            scheduler.remove(self._tasks.pop(metric)[1])
+
+        if interval:
+            self._tasks[metric] = (
+                interval,
+                scheduler.add(interval, self._on_tick, metric, initial_call=False),
+            )
+
+    def _update(self, metric: str):
+        stats = self.sample(metric)
+        self.snapshots[metric] = stats
+        self.history[metric].append(stats.percent)
+
+        if metric == "cpu":
+            while len(self.core_history) < len(stats.per_core):
+                self.core_history.append(RingBuffer(self.history_size))
+            for history, percent in zip(self.core_history, stats.per_core):
+                history.append(percent)
+        elif metric == "memory":
+            self.history["swap"].append(stats.swap_percent)
+
+        self.emit(metric, stats)
+
+    def _on_tick(self, metric: str):
+        self._update(metric)
+        return True
@@ -1,7 +1,10 @@
 # ruff: noqa: F403
 from .animated.circularprogress import *
 from .animated.scale import *
+from .binding import *
 from .buttontoggle import *
 from .customimage import *
 from .popup import *
+from .sparkline import *
+from .tooltip import *
 from .widget_container import *
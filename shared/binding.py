@@ -0,0 +1,79 @@
+import weakref
+
+from gi.repository import GLib, Gtk
+
+
+class Binder:
+    """Class to push values into widgets only when they change.
+
+    Values set within the same main loop iteration are applied together right
+    before GTK lays out and draws the next frame, and only the last value set
+    for a widget property is applied.
+
+    Setters with a matching getter, like ``set_label`` and ``get_label``, are
+    compared with what the widget currently shows, so writes made behind the
+    binder's back are noticed. Other setters, like ``set_from_icon_name``, are
+    compared with the last value the binder applied, so once a widget property
+    is updated through the binder every other write to it has to be as well.
+    """
+
+    def __init__(self):
+        # Last applied arguments of every setter, forgotten with the widget
+        self._applied: weakref.WeakKeyDictionary[Gtk.Widget, dict[str, tuple]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._pending: dict[Gtk.Widget, dict[str, tuple]] = {}
+        self._flush_id = None
+
+        # Setter calls that went through versus the ones that were not needed
+        self.applied = 0
+        self.saved = 0
+
+    def set(self, widget: Gtk.Widget, setter: str, *args):
+        """Call ``widget.<setter>(*args)`` on the next frame, if anything changed."""
+        pending = self._pending.setdefault(widget, {})
+        if setter in pending:
+            # Superseded before it was ever applied
+            self.saved += 1
+        pending[setter] = args
+
+        if self._flush_id is None:
+            # Run ahead of GTK's resize and redraw, which use lower priorities
+            self._flush_id = GLib.idle_add(self.flush, priority=GLib.PRIORITY_HIGH_IDLE)
+
+    def set_label(self, widget: Gtk.Widget, label: str):
+        self.set(widget, "set_label", label)
+
+    def set_tooltip_text(self, widget: Gtk.Widget, text: str | None):
+        self.set(widget, "set_tooltip_text", text)
+
+    def set_visible(self, widget: Gtk.Widget, visible: bool):
+        self.set(widget, "set_visible", visible)
+
+    def flush(self):
+        self._flush_id = None
+        pending, self._pending = self._pending, {}
+
+        for widget, setters in pending.items():
+            applied = self._applied.setdefault(widget, {})
+            for setter, args in setters.items():
+                if self._is_current(widget, setter, args, applied):
+                    self.saved += 1
+                    continue
+                getattr(widget, setter)(*args)
+                applied[setter] = args
+                self.applied += 1
+
+        return False
+
+    def _is_current(
+        self, widget: Gtk.Widget, setter: str, args: tuple, applied: dict[str, tuple]
+    ) -> bool:
+        getter = getattr(widget, f"get_{setter.removeprefix('set_')}", None)
+        if getter is not None and len(args) == 1:
+            return getter() == args[0]
+        return applied.get(setter) == args
+
+
+# Shared by every widget so all updates of a frame are applied in one go
+binder = Binder()
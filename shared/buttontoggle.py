@@ -1,7 +1,9 @@
-from fabric.utils import exec_shell_command, exec_shell_command_async, invoke_repeater
+from fabric.utils import exec_shell_command, exec_shell_command_async
 from fabric.widgets.button import Button
 
 import utils.functions as helpers
+from shared.tooltip import LazyTooltip
+from utils.config import get_process_watcher
 
 
 class CommandSwitcher(Button):
@@ -36,15 +38,22 @@ class CommandSwitcher(Button):
         self.tooltip = tooltip
 
         self.connect("clicked", self.toggle)
-        invoke_repeater(interval, self.update, initial_call=True)
+
+        if self.tooltip:
+            LazyTooltip(self, get_text=self.get_tooltip)
+
+        # One /proc scan per tick is shared by every switcher
+        self.process_watcher = get_process_watcher()
+        self.process_watcher.connect("changed", self.on_process_changed)
+        self.process_watcher.watch(self.command_without_args, interval)
+        self.update()
 
     def is_active(self, *_):
-        return (
-            exec_shell_command(
-                f"bash -c 'pgrep -x {self.command_without_args} > /dev/null && echo yes || echo no'",
-            ).strip()
-            == "yes"
-        )
+        return self.process_watcher.is_running(self.command_without_args)
+
+    def on_process_changed(self, _, name: str, running: bool):
+        if name == self.command_without_args:
+            self.update()
 
     def cat_icon(self, icon: str, text: str):
         return f"{icon} {text}"
@@ -54,28 +63,31 @@ class CommandSwitcher(Button):
             exec_shell_command(f"pkill {self.command_without_args}")
         else:
             exec_shell_command_async(f"bash -c '{self.command}&'", lambda *_: None)
-        return self.update()
+        # The label follows once the watcher sees the process start or stop
+        self.process_watcher.refresh()
 
     def update(self, *_):
+        is_active = self.is_active()
+
         if self.label:
             self.set_label(
                 self.cat_icon(
-                    icon=self.enabled_icon if self.is_active() else self.disabled_icon,
-                    text="On" if self.is_active() else "Off",
+                    icon=self.enabled_icon if is_active else self.disabled_icon,
+                    text="On" if is_active else "Off",
                 ),
             )
         else:
             self.set_label(
                 self.cat_icon(
-                    icon=self.enabled_icon if self.is_active() else self.disabled_icon,
+                    icon=self.enabled_icon if is_active else self.disabled_icon,
                     text="",
                 ),
             )
-
-        if self.tooltip:
-            self.set_tooltip_text(
-                f"{self.command_without_args} enabled"
-                if self.is_active()
-                else f"{self.command_without_args} disabled",
-            )
         return True
+
+    def get_tooltip(self):
+        return (
+            f"{self.command_without_args} enabled"
+            if self.is_active()
+            else f"{self.command_without_args} disabled"
+        )
@@ -0,0 +1,89 @@
+import cairo
+from gi.repository import Gtk
+
+from utils.ringbuffer import RingBuffer
+
+
+class Sparkline(Gtk.DrawingArea):
+    """A widget drawing the history of a metric as a line."""
+
+    def __init__(
+        self,
+        buffer: RingBuffer,
+        max_value: float = 100.0,
+        width: int = 120,
+        height: int = 32,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.buffer = buffer
+        self.max_value = max_value
+
+        self.get_style_context().add_class("sparkline")
+        self.set_size_request(width, height)
+
+    def do_draw(self, cr: cairo.Context):
+        width, height = self.get_allocated_width(), self.get_allocated_height()
+        count = len(self.buffer)
+        if count < 2:
+            return False
+
+        color = self.get_style_context().get_color(Gtk.StateFlags.NORMAL)
+        step = width / (self.buffer.size - 1)
+        # Newest sample on the right edge, older ones scrolling off to the left
+        x = width - step * (count - 1)
+
+        start = x
+        for part in self.buffer.window():
+            for value in part:
+                cr.line_to(x, height - min(value / self.max_value, 1.0) * height)
+                x += step
+
+        cr.set_source_rgba(color.red, color.green, color.blue, color.alpha)
+        cr.set_line_width(1)
+        cr.stroke_preserve()
+
+        # Shade the area under the line
+        cr.line_to(x - step, height)
+        cr.line_to(start, height)
+        cr.close_path()
+        cr.set_source_rgba(color.red, color.green, color.blue, 0.25)
+        cr.fill()
+        return False
+
+
+class BarChart(Gtk.DrawingArea):
+    """A widget drawing the latest value of several metrics as bars."""
+
+    def __init__(
+        self,
+        buffers: list[RingBuffer],
+        max_value: float = 100.0,
+        bar_width: int = 6,
+        height: int = 32,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.buffers = buffers
+        self.max_value = max_value
+        self.bar_width = bar_width
+
+        self.get_style_context().add_class("bar-chart")
+        self.set_size_request(len(buffers) * (bar_width + 2), height)
+
+    def do_draw(self, cr: cairo.Context):
+        height = self.get_allocated_height()
+        color = self.get_style_context().get_color(Gtk.StateFlags.NORMAL)
+
+        for index, buffer in enumerate(self.buffers):
+            x = index * (self.bar_width + 2)
+            value = min(buffer.last() / self.max_value, 1.0)
+
+            # Track behind the bar, then the bar itself
+            cr.set_source_rgba(color.red, color.green, color.blue, 0.2)
+            cr.rectangle(x, 0, self.bar_width, height)
+            cr.fill()
+            cr.set_source_rgba(color.red, color.green, color.blue, color.alpha)
+            cr.rectangle(x, height * (1 - value), self.bar_width, height * value)
+            cr.fill()
+        return False
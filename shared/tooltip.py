@@ -0,0 +1,43 @@
+from typing import Callable
+
+from gi.repository import Gtk
+
+
+class LazyTooltip:
+    """Class to compute the tooltip of a widget only when GTK is about to show it.
+
+    Either ``get_text`` returns the text (or markup) to show, or ``get_custom``
+    returns a widget to show instead. Returning None shows no tooltip at all.
+    """
+
+    def __init__(
+        self,
+        widget: Gtk.Widget,
+        get_text: Callable[[], str | None] | None = None,
+        get_custom: Callable[[], Gtk.Widget | None] | None = None,
+        markup: bool = False,
+    ):
+        self.get_text = get_text
+        self.get_custom = get_custom
+        self.markup = markup
+
+        widget.set_has_tooltip(True)
+        widget.connect("query-tooltip", self.on_query_tooltip)
+
+    def on_query_tooltip(self, _widget, _x, _y, _keyboard_mode, tooltip: Gtk.Tooltip):
+        if self.get_custom:
+            custom = self.get_custom()
+            if custom is None:
+                return False
+            tooltip.set_custom(custom)
+            return True
+
+        text = self.get_text() if self.get_text else None
+        if not text:
+            return False
+
+        if self.markup:
+            tooltip.set_markup(text)
+        else:
+            tooltip.set_text(text)
+        return True
@@ -0,0 +1,86 @@
+import re
+
+import pytest
+
+from utils.classmatcher import WindowClassMatcher
+
+ENTRIES = [
+    ["firefox", "󰈹", "Firefox"],
+    ["org.kde.dolphin", "", "Dolphin"],
+    ["^code(-oss)?$", "󰨞", "VS Code"],
+    ["fire", "", "Fire"],
+    ["steam_app_\\d+", "", "Steam game"],
+    ["kitty|alacritty", "", "Terminal"],
+]
+
+
+# Function to search every entry in turn, which the matcher has to agree with
+def linear(win_class: str, entries: list[list[str]] = ENTRIES):
+    return next(
+        (entry for entry in entries if re.search(entry[0], win_class.lower())), None
+    )
+
+
+@pytest.mark.parametrize(
+    "win_class",
+    [
+        "firefox",
+        "Firefox",
+        "firefox-developer-edition",
+        "org.kde.dolphin",
+        "orgXkdeXdolphin",
+        "code",
+        "code-oss",
+        "vscode",
+        "campfire",
+        "steam_app_12345",
+        "steam_app_",
+        "Alacritty",
+        "some-unknown-app",
+        "",
+    ],
+)
+def test_matches_like_searching_every_entry(win_class):
+    matcher = WindowClassMatcher(ENTRIES)
+
+    assert matcher.match(win_class) == linear(win_class)
+    # Answered from the cache the second time, with the same result
+    assert matcher.match(win_class) == linear(win_class)
+
+
+def test_skips_invalid_title_map_patterns():
+    broken = ["[unclosed", "", "Broken"]
+    matcher = WindowClassMatcher([broken, *ENTRIES])
+
+    # The other entries still match, only the broken one is left out
+    assert broken not in matcher.entries
+    assert matcher.match("[unclosed") is None
+    assert matcher.match("firefox") == ENTRIES[0]
+    assert matcher.match("kitty") == ENTRIES[5]
+
+
+def test_skips_patterns_with_backreferences():
+    entries = [["(a)\\1", "", "Repeated"], ["(?P<x>b)(?P=x)", "", "Named"], *ENTRIES]
+    matcher = WindowClassMatcher(entries)
+
+    assert matcher.entries == ENTRIES
+    assert matcher.match("aa") is None
+    assert matcher.match("code-oss") == ENTRIES[2]
+
+
+@pytest.mark.parametrize(
+    "win_class", ["foo", "bar", "webkit", "web", "[(x)]", "anything", ""]
+)
+def test_groups_do_not_clash_once_combined(win_class):
+    entries = [
+        ["(?P<app>foo)", "", "Foo"],
+        ["(?P<app>bar)", "", "Bar"],
+        ["(web)(kit)", "", "WebKit"],
+        ["\\[\\(x\\)\\]", "", "Brackets"],
+        ["[(]x[)]", "", "Class"],
+        ["(.+)", "", "Anything"],
+    ]
+    matcher = WindowClassMatcher(entries)
+
+    assert matcher.entries == entries
+    assert matcher.match(win_class) == linear(win_class, entries)
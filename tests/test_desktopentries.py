@@ -0,0 +1,39 @@
+import os
+
+from utils.desktopentries import DesktopEntryIndex
+
+
+def write_entry(directory: str, name: str, **keys: str):
+    with open(os.path.join(directory, f"{name}.desktop"), "w") as file:
+        file.write("[Desktop Entry]\n")
+        file.writelines(f"{key}={value}\n" for key, value in keys.items())
+
+
+def test_lookup_by_class_id_exec_and_name(tmp_path):
+    write_entry(
+        tmp_path,
+        "org.example.Editor",
+        Name="Example Editor",
+        Exec="/usr/bin/exedit %F",
+        Icon="editor-icon",
+        StartupWMClass="ExEdit",
+    )
+    index = DesktopEntryIndex([str(tmp_path)], cache_file=None)
+
+    assert index.lookup("exedit") == "editor-icon"
+    assert index.lookup("org.example.editor") == "editor-icon"
+    assert index.lookup("Example Editor") == "editor-icon"
+    # Falls back to a substring of the name
+    assert index.lookup("editor") == "editor-icon"
+
+
+def test_misses_are_cached_until_invalidated(tmp_path):
+    index = DesktopEntryIndex([str(tmp_path)], cache_file=None)
+    assert index.lookup("newapp") is None
+
+    # Not noticed until the index is told the directory changed
+    write_entry(tmp_path, "newapp", Name="New App", Icon="new-icon")
+    assert index.lookup("newapp") is None
+
+    index.invalidate()
+    assert index.lookup("newapp") == "new-icon"
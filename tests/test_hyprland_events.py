@@ -0,0 +1,229 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from utils.hyprland import HyprlandEventBus
+
+# Events the taskbar is re-rendered for
+TASKBAR_EVENTS = (
+    "openwindow",
+    "closewindow",
+    "movewindowv2",
+    "windowtitlev2",
+    "activewindowv2",
+    "changefloatingmode",
+)
+
+# Frames of events where repeats are dropped, the fullscreen events are about
+# whichever window was active when they came in
+FRAMES = [
+    ["openwindow>>c,1,foot,shell", "activewindowv2>>c", "activewindowv2>>c"],
+    ["windowtitlev2>>a,first", "windowtitlev2>>a,second"],
+    ["workspacev2>>2,2"],
+    [
+        "activewindowv2>>a",
+        "fullscreen>>0",
+        "closewindow>>c",
+        "activewindowv2>>b",
+        "fullscreen>>0",
+    ],
+]
+
+
+class FakeConnection:
+    """Stands in for fabric's hyprland connection, keeping the event handlers."""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def connect(self, signal: str, handler):
+        self.handlers[signal.removeprefix("event::")] = handler
+
+    def send(self, line: str):
+        name, _, data = line.partition(">>")
+        if name in self.handlers:
+            self.handlers[name](self, SimpleNamespace(name=name, data=data.split(",")))
+
+
+# Function to send every frame's events and let the main loop draw after each
+def replay(connection: FakeConnection, bus: HyprlandEventBus, on_frame=None):
+    for frame in FRAMES:
+        for line in frame:
+            connection.send(line)
+        bus.flush()
+        if on_frame:
+            on_frame()
+
+
+def test_replay_renders_once_per_frame_with_taskbar_events():
+    connection = FakeConnection()
+    bus = HyprlandEventBus(connection)
+    renders = []
+    bus.subscribe(renders.append, *TASKBAR_EVENTS)
+
+    replay(connection, bus)
+
+    # The workspace switch is no taskbar event, so its frame renders nothing
+    assert [[(name, ",".join(data)) for name, data in batch] for batch in renders] == [
+        [("openwindow", "c,1,foot,shell"), ("activewindowv2", "c")],
+        [("windowtitlev2", "a,second")],
+        [("activewindowv2", "a"), ("closewindow", "c"), ("activewindowv2", "b")],
+    ]
+    assert bus.received == 8
+    assert bus.delivered == 6
+
+
+def test_subscribers_only_get_their_events():
+    connection = FakeConnection()
+    bus = HyprlandEventBus(connection)
+    windows, workspaces = [], []
+    bus.subscribe(windows.append, "activewindowv2")
+    bus.subscribe(workspaces.append, "workspacev2", "activewindowv2")
+
+    connection.send("activewindowv2>>1000")
+    connection.send("workspacev2>>2,2")
+    bus.flush()
+
+    assert windows == [[("activewindowv2", ["1000"])]]
+    assert workspaces == [[("activewindowv2", ["1000"]), ("workspacev2", ["2", "2"])]]
+
+    # Nothing is handed out for a frame without events
+    bus.flush()
+    assert len(windows) == 1
+
+
+def deliver(*lines: str) -> list[tuple[str, str]]:
+    connection = FakeConnection()
+    bus = HyprlandEventBus(connection)
+    batches = []
+    bus.subscribe(batches.append, "activewindowv2", "fullscreen", "windowtitlev2")
+
+    for line in lines:
+        connection.send(line)
+    bus.flush()
+    return [(name, ",".join(data)) for name, data in batches[0]]
+
+
+def test_events_keep_their_order():
+    # The fullscreen events are about whichever window was active at the time
+    assert deliver(
+        "activewindowv2>>a",
+        "fullscreen>>1",
+        "activewindowv2>>b",
+        "fullscreen>>1",
+    ) == [
+        ("activewindowv2", "a"),
+        ("fullscreen", "1"),
+        ("activewindowv2", "b"),
+        ("fullscreen", "1"),
+    ]
+
+
+def test_consecutive_events_are_collapsed():
+    assert deliver(
+        "fullscreen>>1",
+        "fullscreen>>1",
+        "activewindowv2>>a",
+        "activewindowv2>>b",
+        "activewindowv2>>c",
+    ) == [("fullscreen", "1"), ("activewindowv2", "c")]
+
+
+def test_title_changes_replace_the_pending_one_of_the_same_window():
+    assert deliver(
+        "windowtitlev2>>a,first",
+        "activewindowv2>>b",
+        "windowtitlev2>>b,other",
+        "windowtitlev2>>a,second, with a comma",
+    ) == [
+        ("windowtitlev2", "a,second, with a comma"),
+        ("activewindowv2", "b"),
+        ("windowtitlev2", "b,other"),
+    ]
+
+
+# Replies to the requests HyprlandState loads itself with, two windows on DP-1
+REPLIES = {
+    "monitors": [
+        {
+            "id": 0,
+            "name": "DP-1",
+            "focused": True,
+            "activeWorkspace": {"id": 1, "name": "1"},
+        }
+    ],
+    "workspaces": [
+        {"id": 1, "name": "1", "monitor": "DP-1", "monitorID": 0},
+        {"id": 2, "name": "2", "monitor": "DP-1", "monitorID": 0},
+    ],
+    "clients": [
+        {
+            "address": address,
+            "mapped": True,
+            "hidden": False,
+            "workspace": {"id": workspace_id, "name": str(workspace_id)},
+            "monitor": 0,
+            "fullscreen": 1,
+            "class": "foot",
+            "title": "shell",
+        }
+        for address, workspace_id in (("0xa", 1), ("0xb", 2))
+    ],
+    "activewindow": {"address": "0xb"},
+    "devices": {"keyboards": []},
+}
+
+
+class FakeHyprland(FakeConnection):
+    """Answers hyprland's requests from ``REPLIES`` as well as sending events."""
+
+    ready = True
+
+    def send_command(self, command: str):
+        reply = REPLIES[command.removeprefix("j/")]
+        return SimpleNamespace(reply=json.dumps(reply).encode())
+
+
+def test_replay_renders_the_taskbar_once_per_frame(monkeypatch):
+    pytest.importorskip("fabric")
+    import services.hyprland_state
+
+    connection = FakeHyprland()
+    monkeypatch.setattr(
+        services.hyprland_state, "get_hyprland_connection", lambda: connection
+    )
+    state = services.hyprland_state.HyprlandState()
+    renders = []
+    queued = False
+
+    # What the taskbar does with the state, without the buttons
+    def on_state_changed(_, kind: str):
+        nonlocal queued
+        if kind in ("clients", "active"):
+            queued = True
+
+    def render():
+        nonlocal queued
+        if queued:
+            queued = False
+            visible = [
+                address
+                for address, client in state.clients.items()
+                if client["mapped"] and not client["hidden"]
+            ]
+            renders.append((visible, state.active_address))
+
+    state.connect("changed", on_state_changed)
+    replay(connection, state.events, render)
+
+    # The workspace switch only touches the monitors, so its frame renders nothing
+    assert renders == [
+        (["0xa", "0xb", "0xc"], "0xc"),
+        (["0xa", "0xb", "0xc"], "0xc"),
+        (["0xa", "0xb"], "0xb"),
+    ]
+    assert state.get_client("a")["title"] == "second"
+    # Each fullscreen event was applied to the window active when it came in
+    assert [client["fullscreen"] for client in state.clients.values()] == [0, 0]
+    assert state.monitors["DP-1"]["activeWorkspace"]["id"] == 2
@@ -0,0 +1,45 @@
+import pytest
+
+import utils.kblayout as kblayout
+from utils.kblayout import get_layout_label
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    kblayout.get_layout_map.cache_clear()
+    get_layout_label.cache_clear()
+
+
+@pytest.mark.parametrize(
+    ("layout", "label"),
+    [
+        ("English (US)", "US"),
+        ("Albanian (Plisi)", "AL (Plisi)"),
+        # What the widget shows while hyprland reports no keyboard
+        ("Unknown Layout", "Unknown"),
+    ],
+)
+def test_known_layouts_come_from_the_table(layout, label):
+    assert get_layout_label(layout) == label
+
+
+@pytest.mark.parametrize(
+    ("layout", "label"),
+    [
+        ("Klingon (tlhIngan, phonetic)", "KL (Tlhingan Phonetic)"),
+        ("Klingon", "KL"),
+        ("", "??"),
+    ],
+)
+def test_unknown_layouts_are_made_up(layout, label):
+    assert layout not in kblayout.get_layout_map()
+    assert get_layout_label(layout) == label
+
+
+def test_missing_table_falls_back_for_every_layout(monkeypatch, tmp_path):
+    monkeypatch.setattr(kblayout, "KBLAYOUT_FILE", str(tmp_path / "missing.json"))
+
+    assert kblayout.get_layout_map() == {}
+    assert get_layout_label("English (US)") == "EN (Us)"
+    assert get_layout_label("Unknown Layout") == "UN"
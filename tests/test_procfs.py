@@ -0,0 +1,46 @@
+import os
+import shutil
+
+from utils.procfs import CpuReader, MemoryReader, ProcFile
+
+# Snapshots of /proc, stat.next is stat a little later
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "proc")
+
+
+def test_memory_usage_from_meminfo():
+    reader = MemoryReader(FIXTURES)
+
+    used, total, percent, swap_used, swap_total, swap_percent = reader.usage()
+    reader.close()
+
+    # MemTotal minus MemAvailable, reported in kB
+    assert used == (16314412 - 12386260) * 1024
+    assert total == 16314412 * 1024
+    assert percent == 24.1
+    assert (swap_used, swap_total, swap_percent) == (0, 8388604 * 1024, 0.0)
+
+
+def test_cpu_usage_between_two_snapshots(tmp_path):
+    shutil.copyfile(os.path.join(FIXTURES, "stat"), tmp_path / "stat")
+    reader = CpuReader(str(tmp_path))
+
+    # The reader keeps the file open, so the next snapshot is written in place
+    shutil.copyfile(os.path.join(FIXTURES, "stat.next"), tmp_path / "stat")
+    total, cores = reader.usage()
+
+    # cpu0 spent 400 of 1000 ticks busy and cpu1 100 of 1000
+    assert cores == (40.0, 10.0)
+    assert total == 25.0
+
+    # Counters that did not move report no usage instead of dividing by zero
+    assert reader.usage() == (0.0, (0.0, 0.0))
+    reader.close()
+
+
+def test_proc_file_grows_its_buffer():
+    path = os.path.join(FIXTURES, "meminfo")
+    proc_file = ProcFile(path, size=16)
+
+    with open(path, "rb") as file:
+        assert proc_file.read().tobytes() == file.read()
+    proc_file.close()
@@ -0,0 +1,71 @@
+from utils.ringbuffer import RingBuffer
+
+
+# Function to flatten the slices of a window, the way the sparkline walks them
+def samples(buffer: RingBuffer, count: int | None = None) -> list[float]:
+    return [value for part in buffer.window(count) for value in part]
+
+
+def test_appends_wrap_around_and_drop_the_oldest():
+    buffer = RingBuffer(4)
+    for value in range(1, 7):
+        buffer.append(value)
+
+    assert len(buffer) == 4
+    assert buffer.last() == 6.0
+    # 5 and 6 overwrote 1 and 2 at the start of the array
+    assert list(buffer.data) == [5.0, 6.0, 3.0, 4.0]
+
+
+def test_window_is_oldest_first_across_the_wrap():
+    buffer = RingBuffer(4)
+    for value in range(1, 7):
+        buffer.append(value)
+
+    head, tail = buffer.window()
+    assert (list(head), list(tail)) == ([3.0, 4.0], [5.0, 6.0])
+    assert samples(buffer) == [3.0, 4.0, 5.0, 6.0]
+    assert samples(buffer, 3) == [4.0, 5.0, 6.0]
+    assert samples(buffer, 10) == [3.0, 4.0, 5.0, 6.0]
+
+    # Filled up exactly, the window doesn't wrap and the tail is empty
+    buffer.append(7)
+    buffer.append(8)
+    head, tail = buffer.window()
+    assert (list(head), list(tail)) == ([5.0, 6.0, 7.0, 8.0], [])
+    assert buffer.last() == 8.0
+
+
+def test_statistics_only_cover_the_samples_appended():
+    buffer = RingBuffer(8)
+    for value in (4.0, 1.5, 6.5):
+        buffer.append(value)
+
+    # The unused part of the array is zeroed and must not pull the min down
+    assert samples(buffer) == [4.0, 1.5, 6.5]
+    assert buffer.min() == 1.5
+    assert buffer.max() == 6.5
+    assert buffer.avg() == 4.0
+    assert (buffer.min(2), buffer.max(2), buffer.avg(2)) == (1.5, 6.5, 4.0)
+
+
+def test_statistics_across_the_wrap():
+    buffer = RingBuffer(3)
+    for value in (9.0, 1.0, 2.0, 3.0, 7.0):
+        buffer.append(value)
+
+    assert samples(buffer) == [2.0, 3.0, 7.0]
+    assert (buffer.min(), buffer.max(), buffer.avg()) == (2.0, 7.0, 4.0)
+    assert (buffer.min(2), buffer.max(2), buffer.avg(2)) == (3.0, 7.0, 5.0)
+
+
+def test_empty_and_cleared_buffers():
+    buffer = RingBuffer(4)
+    assert samples(buffer) == []
+    assert (buffer.last(), buffer.min(), buffer.max(), buffer.avg()) == (0, 0, 0, 0)
+
+    buffer.append(2.0)
+    buffer.clear()
+    assert len(buffer) == 0
+    assert samples(buffer) == []
+    assert buffer.avg() == 0.0
@@ -0,0 +1,188 @@
+import pytest
+
+import utils.scheduler as scheduler_module
+from utils.scheduler import TimerWheel
+
+
+class FakeLoop:
+    """Stands in for the monotonic clock and GLib's timeouts."""
+
+    def __init__(self):
+        # Milliseconds since the start of the test
+        self.now = 0.0
+        self.sources: dict[int, tuple[float, int, object]] = {}
+        self._next_id = 1
+
+    def monotonic(self) -> float:
+        return self.now / 1000
+
+    def timeout_add(self, delay: int, callback) -> int:
+        source_id = self._next_id
+        self._next_id += 1
+        self.sources[source_id] = (self.now + delay, delay, callback)
+        return source_id
+
+    def source_remove(self, source_id: int):
+        del self.sources[source_id]
+
+    def advance(self, ms: float):
+        end = self.now + ms
+        while self.sources:
+            source_id = min(self.sources, key=lambda key: self.sources[key][0])
+            deadline, delay, callback = self.sources[source_id]
+            if deadline > end:
+                break
+
+            self.now = deadline
+            del self.sources[source_id]
+            if callback():
+                self.sources[source_id] = (self.now + delay, delay, callback)
+        self.now = end
+
+
+@pytest.fixture
+def loop(monkeypatch) -> FakeLoop:
+    loop = FakeLoop()
+    monkeypatch.setattr(scheduler_module, "GLib", loop)
+    monkeypatch.setattr(scheduler_module, "time", loop)
+    return loop
+
+
+def record(loop: FakeLoop, calls: list[float]):
+    def callback():
+        calls.append(loop.now)
+        return True
+
+    return callback
+
+
+def test_intervals_are_aligned_to_their_multiples(loop):
+    wheel = TimerWheel(resolution=250)
+    loop.advance(100)
+
+    calls = []
+    wheel.add(1000, record(loop, calls), initial_call=False)
+    loop.advance(3000)
+
+    # Added 100 ms in, but still fires on whole seconds
+    assert calls == [1000, 2000, 3000]
+
+
+def test_intervals_are_rounded_up_to_the_resolution(loop):
+    wheel = TimerWheel(resolution=250)
+
+    calls = []
+    wheel.add(1100, record(loop, calls), initial_call=False)
+    loop.advance(2500)
+
+    assert calls == [1250, 2500]
+
+
+def test_compatible_intervals_share_wakeups(loop):
+    wheel = TimerWheel(resolution=250)
+
+    for interval in (1000, 2000, 4000):
+        wheel.add(interval, lambda: True, initial_call=False)
+    loop.advance(4000)
+
+    # Seven callbacks, but the 2 s and 4 s tasks ride along the 1 s ticks
+    assert wheel.calls == 7
+    assert wheel.wakeups == 4
+    assert wheel.wakeups_per_second() == pytest.approx(1.0)
+
+
+def test_incompatible_intervals_wake_up_separately(loop):
+    wheel = TimerWheel(resolution=250)
+
+    for interval in (750, 1000):
+        wheel.add(interval, lambda: True, initial_call=False)
+    loop.advance(3000)
+
+    # 750, 1000, 1500, 2000, 2250 and 3000, where both tasks meet
+    assert wheel.calls == 7
+    assert wheel.wakeups == 6
+    assert wheel.wakeups_per_second() == pytest.approx(2.0)
+
+    wheel.reset_stats()
+    assert wheel.wakeups_per_second() == 0.0
+    loop.advance(3000)
+    assert wheel.wakeups_per_second() == pytest.approx(2.0)
+
+
+def test_pause_holds_back_periodic_tasks_and_resume_catches_up(loop):
+    wheel = TimerWheel(resolution=250)
+
+    calls = []
+    once = []
+    wheel.add(1000, record(loop, calls), initial_call=False)
+    loop.advance(1000)
+
+    wheel.pause("hidden")
+    wheel.pause("idle")
+    wheel.call_later(500, lambda: once.append(loop.now))
+    loop.advance(4000)
+
+    # One-shot tasks keep running, periodic ones don't wake the loop at all
+    assert calls == [1000]
+    assert once == [1500]
+    assert not loop.sources
+
+    # Every reason has to go away before anything runs again
+    wheel.resume("hidden")
+    assert calls == [1000]
+
+    loop.advance(100)
+    wheel.resume("idle")
+    assert calls == [1000, 5100]
+
+    loop.advance(900)
+    assert calls == [1000, 5100, 6000]
+
+
+def test_resume_only_runs_tasks_that_came_due(loop):
+    wheel = TimerWheel(resolution=250)
+
+    slow = []
+    fast = []
+    wheel.add(10_000, record(loop, slow), initial_call=False)
+    wheel.add(1000, record(loop, fast), initial_call=False)
+
+    wheel.pause("hidden")
+    loop.advance(3100)
+    wheel.resume("hidden")
+
+    # The 1 s task missed its ticks and catches up, the 10 s one isn't due yet
+    assert fast == [3100]
+    assert slow == []
+
+    loop.advance(6900)
+    assert slow == [10_000]
+    assert fast == [3100, 4000, 5000, 6000, 7000, 8000, 9000, 10_000]
+
+
+def test_set_scale_applies_to_running_tasks(loop):
+    wheel = TimerWheel(resolution=250)
+
+    calls = []
+    wheel.add(1000, record(loop, calls), initial_call=False)
+    wheel.set_scale(2.0)
+    loop.advance(4000)
+    assert calls == [2000, 4000]
+
+    wheel.set_scale(1.0)
+    loop.advance(2000)
+    assert calls == [2000, 4000, 5000, 6000]
+
+
+def test_tasks_stop_when_removed_or_returning_false(loop):
+    wheel = TimerWheel(resolution=250)
+
+    calls = []
+    task_id = wheel.add(1000, record(loop, calls))
+    wheel.add(1000, lambda: calls.append("once"), initial_call=False)
+    loop.advance(1000)
+    wheel.remove(task_id)
+    loop.advance(2000)
+
+    assert calls == [0, 1000, "once"]
+    assert not loop.sources
@@ -0,0 +1,120 @@
+import re
+from functools import lru_cache
+
+from loguru import logger
+
+from utils.colors import Colors
+
+# Characters that make a pattern more than a plain window class
+REGEX_CHARACTERS = set(".^$*+?{}[]\\|()")
+
+
+# Function to turn the groups of a pattern into non-capturing ones, so patterns
+# can be combined without their group numbers and names clashing. Backreferences
+# and conditionals need the groups they refer to, so they raise re.error instead
+def strip_groups(pattern: str) -> str:
+    result = []
+    in_class = False
+    index = 0
+
+    while index < len(pattern):
+        char = pattern[index]
+
+        if char == "\\":
+            escaped = pattern[index + 1 : index + 2]
+            if escaped.isdigit() and escaped != "0" and not in_class:
+                raise re.error("backreferences are not supported", pattern, index)
+            result.append(pattern[index : index + 2])
+            index += 2
+            continue
+
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # A "]" right at the start of a class is a literal, not its end
+            for literal in ("^]", "]", "^"):
+                if pattern.startswith(literal, index + 1):
+                    result.append(char + literal)
+                    index += 1 + len(literal)
+                    break
+            else:
+                result.append(char)
+                index += 1
+            continue
+        elif char == "(":
+            if pattern.startswith(("(?P=", "(?("), index):
+                raise re.error("backreferences are not supported", pattern, index)
+            # A name that never ends is left for re.compile to complain about
+            if pattern.startswith("(?P<", index) and ">" in pattern[index:]:
+                index = pattern.index(">", index) + 1
+                result.append("(?:")
+                continue
+            if not pattern.startswith("(?", index):
+                result.append("(?:")
+                index += 1
+                continue
+
+        result.append(char)
+        index += 1
+
+    return "".join(result)
+
+
+class WindowClassMatcher:
+    """Class to find the first entry whose pattern is found in a window class.
+
+    Entries are ``[pattern, icon, title]`` lists, searched in order like
+    ``re.search`` over each of them would. All patterns are compiled into one
+    regex, plain classes are answered from a dict, and results are cached.
+    Entries whose pattern is invalid or uses backreferences are skipped.
+    """
+
+    def __init__(self, entries: list[list[str]], cache_size: int = 256):
+        self.entries = []
+        patterns = []
+
+        # A single broken pattern would otherwise make the combined regex fail
+        for entry in entries:
+            try:
+                pattern = f"(?=.*?(?:{strip_groups(entry[0])}))"
+                re.compile(pattern)
+            except re.error as e:
+                logger.warning(
+                    f"{Colors.WARNING}[WindowTitle] Skipping the pattern "
+                    f"{entry[0]!r}: {e}"
+                )
+                continue
+            self.entries.append(entry)
+            patterns.append(pattern)
+
+        # Every alternative looks ahead from the start of the class, so the first
+        # entry that matches anywhere wins, and marks itself with an empty group
+        self.pattern = re.compile(
+            "|".join(
+                f"{pattern}(?P<entry{index}>)" for index, pattern in enumerate(patterns)
+            ),
+            re.DOTALL,
+        )
+
+        # Classes spelled out as a pattern, resolved up front with the same rules
+        self.exact = {
+            pattern: self.search(pattern)
+            for pattern, *_ in self.entries
+            if not REGEX_CHARACTERS.intersection(pattern)
+        }
+
+        self.match = lru_cache(maxsize=cache_size)(self._match)
+
+    def search(self, win_class: str) -> list[str] | None:
+        match = self.pattern.match(win_class)
+        # Without any valid entry the combined regex is empty and matches anything
+        if match is None or match.lastgroup is None:
+            return None
+        return self.entries[int(match.lastgroup.removeprefix("entry"))]
+
+    def _match(self, win_class: str) -> list[str] | None:
+        win_class = win_class.lower()
+        if win_class in self.exact:
+            return self.exact[win_class]
+        return self.search(win_class)
@@ -1,6 +1,87 @@
-from fabric.audio import Audio
+from functools import cache
 
-from services.brightness import Brightness
+from utils.profiler import profiler
+from utils.widget_config import widget_config
 
-brightness_service = Brightness()
-audio_service = Audio()
+# Every service is created the first time something asks for it, so a layout
+# only starts the services its widgets use and `--build-themes` starts none
+
+
+@cache
+def get_brightness_service():
+    from services.brightness import Brightness
+
+    with profiler.measure("brightness_service", "service"):
+        return Brightness()
+
+
+@cache
+def get_audio_service():
+    from fabric.audio import Audio
+
+    with profiler.measure("audio_service", "service"):
+        return Audio()
+
+
+@cache
+def get_theme_manager():
+    from services.stylesheet import ThemeManager
+
+    return ThemeManager()
+
+
+@cache
+def get_battery_service():
+    from services.battery import BatteryStatus
+
+    with profiler.measure("battery_service", "service"):
+        return BatteryStatus(interval=widget_config["battery"]["interval"])
+
+
+# Shared by every CommandSwitcher to know whether its command runs
+@cache
+def get_process_watcher():
+    from services.processwatch import ProcessWatcher
+
+    return ProcessWatcher()
+
+
+# Shared by every stats widget on every bar, so usage is sampled only once
+@cache
+def get_system_stats_service():
+    from services.systemstats import SystemStats
+
+    return SystemStats()
+
+
+@cache
+def get_power_profiles_service():
+    from services.powerprofile import PowerProfiles
+
+    with profiler.measure("power_profiles_service", "service"):
+        return PowerProfiles()
+
+
+# Slows down every poller registered with the scheduler while on battery
+@cache
+def get_polling_policy():
+    from services.powerprofile import PollingPolicy
+
+    return PollingPolicy(get_power_profiles_service(), widget_config["polling"])
+
+
+# Copy of hyprland's state kept current from its events, shared by every widget
+@cache
+def get_hyprland_state():
+    from services.hyprland_state import HyprlandState
+
+    with profiler.measure("hyprland_state", "service"):
+        return HyprlandState()
+
+
+# Pauses every poller registered with the scheduler while the bar can't be seen
+@cache
+def get_activity_monitor():
+    from services.activity import ActivityMonitor
+
+    return ActivityMonitor()
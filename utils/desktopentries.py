@@ -0,0 +1,202 @@
+import json
+import os
+
+from gi.repository import Gio, GLib
+from loguru import logger
+
+from utils.colors import Colors
+
+CACHE_FILE = os.path.join(
+    GLib.get_user_cache_dir(), "hydepanel", "desktop-entries.json"
+)
+# Bumped whenever the layout of the cache file changes
+CACHE_VERSION = 1
+INDEXED_KEYS = ("Name", "Icon", "StartupWMClass", "Exec")
+
+
+# Function to list the directories desktop entries are read from, by priority
+def get_application_dirs() -> list[str]:
+    return [
+        os.path.join(data_dir, "applications")
+        for data_dir in (GLib.get_user_data_dir(), *GLib.get_system_data_dirs())
+    ]
+
+
+# Function to read the keys of the [Desktop Entry] group that identify an app
+def parse_desktop_entry(path: str) -> dict[str, str]:
+    entry = {}
+    in_main_group = False
+
+    with open(path, errors="replace") as file:
+        for line in file:
+            line = line.strip()
+            if line.startswith("["):
+                # Actions and other groups come after the main one
+                if in_main_group:
+                    break
+                in_main_group = line == "[Desktop Entry]"
+                continue
+
+            if not in_main_group or "=" not in line:
+                continue
+
+            key, value = line.split("=", 1)
+            key = key.strip()
+            if key in INDEXED_KEYS and key not in entry:
+                entry[key] = value.strip()
+
+    return entry
+
+
+class DesktopEntryIndex:
+    """Class to look up the icon of an application by its window class.
+
+    Entries are indexed by StartupWMClass, desktop file id, Name and the binary
+    in Exec. The index is cached on disk, rebuilt when an applications directory
+    changes, and kept up to date with file monitors while running.
+    """
+
+    def __init__(
+        self, dirs: list[str] | None = None, cache_file: str | None = CACHE_FILE
+    ):
+        self.dirs = dirs if dirs is not None else get_application_dirs()
+        self.cache_file = cache_file
+
+        # Lowercase keys mapped to icon names
+        self.icons: dict[str, str] = {}
+        # (lowercase name, icon) pairs for the substring fallback
+        self.names: list[tuple[str, str]] = []
+        # Answers of the substring fallback, misses included, until the next load
+        self._fallback: dict[str, str | None] = {}
+        self._stale = True
+        self._monitors: list[Gio.FileMonitor] = []
+
+    def lookup(self, window_class: str) -> str | None:
+        if self._stale:
+            self.load()
+
+        window_class = window_class.lower()
+        icon = self.icons.get(window_class)
+        if icon:
+            return icon
+
+        if window_class not in self._fallback:
+            # Window classes that only show up within an application name
+            self._fallback[window_class] = next(
+                (icon for name, icon in self.names if window_class in name), None
+            )
+        return self._fallback[window_class]
+
+    def get_dir_mtimes(self) -> dict[str, int]:
+        return {
+            directory: os.stat(directory).st_mtime_ns
+            for directory in self.dirs
+            if os.path.isdir(directory)
+        }
+
+    def load(self):
+        mtimes = self.get_dir_mtimes()
+        if not self._load_cache(mtimes):
+            self.build()
+            self._write_cache(mtimes)
+
+        self._fallback = {}
+        self._stale = False
+        self._watch()
+
+    def build(self):
+        icons = {}
+        names = []
+
+        for directory in self.dirs:
+            try:
+                files = sorted(os.listdir(directory))
+            except OSError:
+                continue
+
+            for desktop_file in files:
+                if not desktop_file.endswith(".desktop"):
+                    continue
+
+                try:
+                    entry = parse_desktop_entry(os.path.join(directory, desktop_file))
+                except OSError as e:
+                    logger.error(f"{Colors.FAIL}Error reading {desktop_file}: {e}")
+                    continue
+
+                icon = entry.get("Icon")
+                if not icon:
+                    continue
+
+                keys = [desktop_file[: -len(".desktop")], entry.get("StartupWMClass")]
+                if entry.get("Exec"):
+                    keys.append(os.path.basename(entry["Exec"].split()[0]))
+                if entry.get("Name"):
+                    keys.append(entry["Name"])
+                    names.append((entry["Name"].lower(), icon))
+
+                # Earlier directories take precedence, like in the XDG spec
+                for key in keys:
+                    if key:
+                        icons.setdefault(key.lower(), icon)
+
+        self.icons = icons
+        self.names = names
+        self._fallback = {}
+        self._stale = False
+
+    def invalidate(self, *_):
+        self._fallback = {}
+        self._stale = True
+
+    def _load_cache(self, mtimes: dict[str, int]) -> bool:
+        if not self.cache_file:
+            return False
+        try:
+            with open(self.cache_file) as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return False
+
+        if cache.get("version") != CACHE_VERSION or cache.get("dirs") != mtimes:
+            return False
+
+        self.icons = cache["icons"]
+        self.names = [tuple(name) for name in cache["names"]]
+        return True
+
+    def _write_cache(self, mtimes: dict[str, int]):
+        if not self.cache_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file, "w") as file:
+                json.dump(
+                    {
+                        "version": CACHE_VERSION,
+                        "dirs": mtimes,
+                        "icons": self.icons,
+                        "names": self.names,
+                    },
+                    file,
+                )
+        except OSError as e:
+            logger.warning(f"{Colors.WARNING}Failed to cache desktop entries: {e}")
+
+    def _watch(self):
+        if self._monitors:
+            return
+
+        for directory in self.dirs:
+            if not os.path.isdir(directory):
+                continue
+            monitor = Gio.File.new_for_path(directory).monitor_directory(
+                Gio.FileMonitorFlags.NONE, None
+            )
+            # Rebuilt lazily on the next lookup, so bursts of changes cost one build
+            monitor.connect("changed", self.invalidate)
+            self._monitors.append(monitor)
+
+
+# Shared by every taskbar, built on the first lookup
+desktop_entries = DesktopEntryIndex()
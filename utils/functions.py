@@ -1,6 +1,5 @@
 import datetime
 import json
-import os
 import shutil
 import subprocess
 from typing import Literal
@@ -27,33 +26,6 @@ class ExecutableNotFoundError(ImportError):
         )
 
 
-# Function to get the system icon theme
-def copy_theme(theme: str):
-    destination_file = get_relative_path("../styles/theme.scss")
-    source_file = get_relative_path(f"../styles/themes/{theme}.scss")
-
-    if not os.path.exists(source_file):
-        logger.warning(
-            f"{Colors.WARNING}Warning: The theme file '{theme}.scss' was not found. Using default theme."
-        )
-        source_file = get_relative_path("../styles/themes/catpuccin-mocha.scss")
-
-    try:
-        with open(source_file, "r") as source_file:
-            content = source_file.read()
-
-        # Open the destination file in write mode
-        with open(destination_file, "w") as destination_file:
-            destination_file.write(content)
-            logger.info(f"{Colors.OKBLUE}[THEME] '{theme}' applied successfully.")
-
-    except FileNotFoundError:
-        logger.error(
-            f"{Colors.FAIL}Error: The theme file '{source_file}' was not found."
-        )
-        exit(1)
-
-
 # Function to read the configuration file
 def read_config():
     with open(get_relative_path("../config.json")) as file:
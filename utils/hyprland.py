@@ -0,0 +1,266 @@
+import json
+import os
+from collections import deque
+from functools import partial
+from typing import Callable
+
+from gi.repository import Gio, GLib
+from loguru import logger
+
+from utils.colors import Colors
+
+# Replies are handed over as they were read, or None when the request failed
+ReplyCallback = Callable[[bytes | None], None]
+
+READ_SIZE = 8192
+
+# Events where only the latest one matters, mapped to how many leading fields
+# name what they are about, like the address of the window whose title changed
+LATEST_ONLY_EVENTS = {
+    "activewindow": 0,
+    "activewindowv2": 0,
+    "windowtitle": 1,
+    "windowtitlev2": 1,
+}
+# Of those, the ones no other event depends on, replaced wherever they are
+REPLACEABLE_EVENTS = {"windowtitle", "windowtitlev2"}
+
+
+# Function to get the path of one of hyprland's sockets
+def get_socket_path(name: str = ".socket.sock") -> str:
+    signature = os.environ.get("HYPRLAND_INSTANCE_SIGNATURE", "")
+    runtime_dir = os.path.join(GLib.get_user_runtime_dir(), "hypr", signature)
+    if not os.path.isdir(runtime_dir):
+        # Where hyprland kept its sockets before 0.40
+        runtime_dir = os.path.join("/tmp/hypr", signature)
+    return os.path.join(runtime_dir, name)
+
+
+# Function to split the reply of a batch of j/ requests into the parsed replies
+def parse_json_batch(reply: bytes) -> list:
+    decoder = json.JSONDecoder()
+    text = reply.decode(errors="replace")
+    values = []
+    index = 0
+    while True:
+        # Hyprland joins the replies without a separator
+        while index < len(text) and text[index].isspace():
+            index += 1
+        if index == len(text):
+            return values
+        value, index = decoder.raw_decode(text, index)
+        values.append(value)
+
+
+class HyprlandClient:
+    """Class to send requests to hyprland without blocking the main loop.
+
+    Hyprland answers a single request per connection and then closes it, so the
+    pool bounds how many connections are open at once rather than reusing them.
+    Requests over that limit wait in line, and several commands can share one
+    connection as a ``[[BATCH]]`` request.
+    """
+
+    def __init__(self, socket_path: str | None = None, max_connections: int = 4):
+        self.address = Gio.UnixSocketAddress.new(socket_path or get_socket_path())
+        self.max_connections = max_connections
+
+        self._client = Gio.SocketClient.new()
+        self._queue: deque[tuple[bytes, ReplyCallback | None]] = deque()
+        self._open = 0
+
+    def send(self, command: str, callback: ReplyCallback | None = None):
+        """Send ``command`` and call ``callback`` with the raw reply."""
+        self._queue.append((command.encode(), callback))
+        self._next()
+
+    def send_json(self, command: str, callback: Callable[[object], None]):
+        """Send ``command`` with the json flag and call ``callback`` with the parsed
+        reply, or None when the request failed."""
+        self.send(
+            f"j/{command}",
+            lambda reply: callback(self._parse(reply, json.loads)),
+        )
+
+    def batch(self, commands: list[str], callback: ReplyCallback | None = None):
+        """Send ``commands`` over a single connection."""
+        self.send(f"[[BATCH]]{';'.join(commands)}", callback)
+
+    def batch_json(self, commands: list[str], callback: Callable[[list], None]):
+        """Send ``commands`` with the json flag over a single connection and call
+        ``callback`` with their parsed replies, or None when the request failed."""
+        self.batch(
+            [f"j/{command}" for command in commands],
+            lambda reply: callback(self._parse(reply, parse_json_batch)),
+        )
+
+    def dispatch(self, *dispatches: str, callback: ReplyCallback | None = None):
+        """Run dispatchers like ``"focuswindow address:0x..."``, several at once
+        as a single batch."""
+        commands = [f"dispatch {dispatch}" for dispatch in dispatches]
+
+        def on_reply(reply: bytes | None):
+            # Every dispatcher answers ok, or with what went wrong
+            if reply is not None and reply != b"ok" * len(commands):
+                logger.warning(
+                    f"{Colors.WARNING}[Hyprland] Dispatch of {', '.join(dispatches)} "
+                    f"failed: {reply.decode(errors='replace')}"
+                )
+            if callback:
+                callback(reply)
+
+        if len(commands) == 1:
+            self.send(commands[0], on_reply)
+        else:
+            self.batch(commands, on_reply)
+
+    def _parse(self, reply: bytes | None, parse: Callable):
+        if reply is None:
+            return None
+        try:
+            return parse(reply)
+        except ValueError as e:
+            logger.warning(f"{Colors.WARNING}[Hyprland] Invalid reply: {e}")
+            return None
+
+    def _next(self):
+        while self._queue and self._open < self.max_connections:
+            self._open += 1
+            request, callback = self._queue.popleft()
+            self._client.connect_async(
+                self.address, None, partial(self._on_connected, request, callback)
+            )
+
+    def _on_connected(self, request, callback, client, result):
+        try:
+            connection = client.connect_finish(result)
+        except GLib.Error as e:
+            self._done(None, callback, f"connect: {e.message}")
+            return
+
+        connection.get_output_stream().write_all_async(
+            request,
+            GLib.PRIORITY_DEFAULT,
+            None,
+            partial(self._on_written, connection, callback),
+        )
+
+    def _on_written(self, connection, callback, stream, result):
+        try:
+            stream.write_all_finish(result)
+        except GLib.Error as e:
+            connection.close(None)
+            self._done(None, callback, f"write: {e.message}")
+            return
+
+        self._read(connection, bytearray(), callback)
+
+    def _read(self, connection, reply: bytearray, callback):
+        connection.get_input_stream().read_bytes_async(
+            READ_SIZE,
+            GLib.PRIORITY_DEFAULT,
+            None,
+            partial(self._on_read, connection, reply, callback),
+        )
+
+    def _on_read(self, connection, reply, callback, stream, result):
+        try:
+            data = stream.read_bytes_finish(result).get_data()
+        except GLib.Error as e:
+            connection.close(None)
+            self._done(None, callback, f"read: {e.message}")
+            return
+
+        if data:
+            reply.extend(data)
+            self._read(connection, reply, callback)
+            return
+
+        # Hyprland closes the connection once the whole reply is written
+        connection.close(None)
+        self._done(bytes(reply), callback)
+
+    def _done(self, reply: bytes | None, callback, error: str | None = None):
+        self._open -= 1
+        if error:
+            logger.warning(f"{Colors.WARNING}[Hyprland] Request failed, {error}")
+        if callback:
+            callback(reply)
+        self._next()
+
+
+class HyprlandEventBus:
+    """Class to hand hyprland's events to subscribers once per frame.
+
+    Events arriving before the next frame are collected in the order they
+    arrived. An event that repeats or supersedes the one right before it
+    replaces that one, and a title change replaces the pending title change of
+    the same window. Every subscriber gets a single batch with the events it
+    asked for.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._subscribers: list[tuple[Callable[[list], None], frozenset[str]]] = []
+        self._connected: set[str] = set()
+        # (key, name, data) of the events since the last frame, kept in order
+        self._pending: list[tuple[tuple[str, ...], str, list[str]]] = []
+        # Where the events in REPLACEABLE_EVENTS are in the pending list
+        self._positions: dict[tuple[str, ...], int] = {}
+        self._flush_id = None
+
+        # Events received versus the ones handed out after dropping repeats
+        self.received = 0
+        self.delivered = 0
+
+    def subscribe(self, callback: Callable[[list], None], *events: str):
+        """Call ``callback`` with a list of ``(name, data)`` for ``events``."""
+        self._subscribers.append((callback, frozenset(events)))
+        for event in set(events) - self._connected:
+            self._connected.add(event)
+            self.connection.connect(f"event::{event}", self.on_event)
+
+    def on_event(self, _, event):
+        self.push(event.name, event.data)
+
+    def push(self, name: str, data: list[str]):
+        self.received += 1
+        fields = LATEST_ONLY_EVENTS.get(name)
+        key = (name, *(data if fields is None else data[:fields]))
+
+        if self._pending and self._pending[-1][0] == key:
+            # Nothing came in between, so the previous event is of no use anymore
+            self._pending[-1] = (key, name, data)
+        elif key in self._positions:
+            self._pending[self._positions[key]] = (key, name, data)
+        else:
+            if name in REPLACEABLE_EVENTS:
+                self._positions[key] = len(self._pending)
+            self._pending.append((key, name, data))
+
+        if self._flush_id is None:
+            # Run ahead of GTK's resize and redraw, which use lower priorities
+            self._flush_id = GLib.idle_add(self.flush, priority=GLib.PRIORITY_HIGH_IDLE)
+
+    def flush(self):
+        self._flush_id = None
+        pending, self._pending = self._pending, []
+        self._positions = {}
+        self.delivered += len(pending)
+
+        for callback, events in self._subscribers:
+            batch = [(name, data) for _, name, data in pending if name in events]
+            if batch:
+                callback(batch)
+        return False
+
+
+# Shared by everything that talks to hyprland, created on first use
+_client = None
+
+
+def get_hyprland_client() -> HyprlandClient:
+    global _client
+    if _client is None:
+        _client = HyprlandClient()
+    return _client
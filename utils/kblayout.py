@@ -0,0 +1,40 @@
+import json
+import os
+from functools import cache, lru_cache
+
+from loguru import logger
+
+from utils.colors import Colors
+
+# Names of the xkb layouts mapped to their short form, sourced from hyprpanel
+KBLAYOUT_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "assets",
+    "data",
+    "kblayouts.json",
+)
+
+
+# Function to read the layout table, only once a label is first needed
+@cache
+def get_layout_map() -> dict[str, str]:
+    try:
+        with open(KBLAYOUT_FILE) as file:
+            return json.load(file)
+    except (OSError, ValueError) as e:
+        logger.warning(f"{Colors.WARNING}[Keyboard] Failed to read layouts: {e}")
+        return {}
+
+
+# Function to get the short form of a layout, made up for ones not in the table
+@lru_cache(maxsize=32)
+def get_layout_label(layout: str) -> str:
+    label = get_layout_map().get(layout)
+    if label:
+        return label
+
+    # "Klingon (tlhIngan, phonetic)" becomes "KL (Tlhingan Phonetic)"
+    name, _, variant = layout.partition(" (")
+    code = name[:2].upper() or "??"
+    variant = " ".join(variant.rstrip(")").replace(",", " ").split()).title()
+    return f"{code} ({variant})" if variant else code
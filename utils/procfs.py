@@ -0,0 +1,130 @@
+import os
+
+# Where the kernel exposes its counters, overridable to read from fixtures
+PROC_DIR = "/proc"
+
+# Fields of /proc/meminfo needed to compute the memory and swap usage
+MEMINFO_FIELDS = (b"MemTotal:", b"MemAvailable:", b"SwapTotal:", b"SwapFree:")
+
+
+class ProcFile:
+    """Class to re-read a file under /proc into a preallocated buffer."""
+
+    def __init__(self, path: str, size: int = 8192):
+        self.path = path
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        # Kept open for the lifetime of the reader, proc files re-render on read
+        self.fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+
+    def read(self) -> memoryview:
+        length = os.preadv(self.fd, [self.buffer], 0)
+
+        # Grow the buffer should the file ever outgrow it, e.g. with many cores
+        while length == len(self.buffer):
+            self.buffer = bytearray(len(self.buffer) * 2)
+            self.view = memoryview(self.buffer)
+            length = os.preadv(self.fd, [self.buffer], 0)
+
+        return self.view[:length]
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class CpuReader:
+    """Class to compute the total and per-core cpu usage from /proc/stat."""
+
+    def __init__(self, proc_dir: str = PROC_DIR):
+        self.file = ProcFile(os.path.join(proc_dir, "stat"))
+        # Counters of the previous read, the aggregate "cpu" line comes first
+        self._idle: list[int] = []
+        self._total: list[int] = []
+        # Prime the counters so the first sample covers the time since creation
+        self.usage()
+
+    def usage(self) -> tuple[float, tuple[float, ...]]:
+        """Return the total cpu usage and the usage of every core in percent."""
+        data = self.file.read()
+        buffer = self.file.buffer
+        percents = []
+        start = index = 0
+
+        # Lines look like "cpu0 user nice system idle iowait irq softirq steal ..."
+        while buffer.startswith(b"cpu", start):
+            end = buffer.find(b"\n", start, len(data))
+            fields = data[start:end].tobytes().split()[1:9]
+
+            # Guest time is already part of user time, so it is left out of the total
+            total = sum(map(int, fields))
+            idle = int(fields[3]) + int(fields[4])
+
+            if index == len(self._total):
+                self._total.append(0)
+                self._idle.append(0)
+
+            delta_total = total - self._total[index]
+            delta_idle = idle - self._idle[index]
+            self._total[index] = total
+            self._idle[index] = idle
+
+            percents.append(
+                round(100 * (delta_total - delta_idle) / delta_total, 1)
+                if delta_total > 0
+                else 0.0
+            )
+            start = end + 1
+            index += 1
+
+        return percents[0], tuple(percents[1:])
+
+    def close(self):
+        self.file.close()
+
+
+class MemoryReader:
+    """Class to read the memory and swap usage from /proc/meminfo."""
+
+    def __init__(self, proc_dir: str = PROC_DIR):
+        self.file = ProcFile(os.path.join(proc_dir, "meminfo"))
+
+    def read_fields(self) -> dict[bytes, int]:
+        data = self.file.read()
+        buffer = self.file.buffer
+        values = {}
+
+        for field in MEMINFO_FIELDS:
+            start = buffer.find(field, 0, len(data))
+            if start < 0:
+                values[field] = 0
+                continue
+            end = buffer.find(b"\n", start)
+            # Values are reported in kB, e.g. "MemTotal:       16314412 kB"
+            values[field] = (
+                int(data[start + len(field) : end].tobytes().split()[0]) * 1024
+            )
+
+        return values
+
+    def usage(self) -> tuple[int, int, float, int, int, float]:
+        """Return the used and total memory and swap in bytes with their percentage."""
+        values = self.read_fields()
+
+        total = values[b"MemTotal:"]
+        used = total - values[b"MemAvailable:"]
+        swap_total = values[b"SwapTotal:"]
+        swap_used = swap_total - values[b"SwapFree:"]
+
+        return (
+            used,
+            total,
+            round(100 * used / total, 1) if total else 0.0,
+            swap_used,
+            swap_total,
+            round(100 * swap_used / swap_total, 1) if swap_total else 0.0,
+        )
+
+    def close(self):
+        self.file.close()
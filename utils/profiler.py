@@ -0,0 +1,118 @@
+import contextlib
+import json
+import os
+import time
+
+import psutil
+from gi.repository import GLib, Gtk
+from loguru import logger
+
+from utils.colors import Colors
+
+PROFILE_FLAG = "--profile-startup"
+
+
+class StartupProfiler:
+    """Class to record how long each part of the startup takes."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.output = "startup-trace.json"
+        # (name, category, start, duration) in seconds since the process started
+        self.events: list[tuple[str, str, float, float]] = []
+
+        # Measure from the start of the process so imports are accounted for
+        process_age = time.time() - psutil.Process().create_time()
+        self._origin = time.perf_counter() - process_age
+        self._pending_windows: set[str] = set()
+        self._finished = False
+
+    def now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    @contextlib.contextmanager
+    def measure(self, name: str, category: str = "startup"):
+        if not self.enabled:
+            yield
+            return
+
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.events.append((name, category, start, self.now() - start))
+
+    def track_window(self, name: str, window: Gtk.Window):
+        """Record when a window is mapped for the first time."""
+        if not self.enabled:
+            return
+
+        if window.get_mapped():
+            self.events.append((f"first map: {name}", "window", 0.0, self.now()))
+            self._schedule_finish()
+            return
+
+        # Hidden windows like the osd only map on demand, so don't wait for them
+        if window.get_visible():
+            self._pending_windows.add(name)
+
+        def on_map(*_):
+            window.disconnect(handler_id)
+            self.events.append((f"first map: {name}", "window", 0.0, self.now()))
+            self._pending_windows.discard(name)
+            self._schedule_finish()
+
+        handler_id = window.connect("map-event", on_map)
+        self._schedule_finish()
+
+    def _schedule_finish(self):
+        # Idle callbacks only run once the main loop starts, after all tracking
+        if not self._pending_windows:
+            GLib.idle_add(self.finish)
+
+    def finish(self):
+        if not self.enabled or self._finished:
+            return False
+        self._finished = True
+
+        logger.info(f"{Colors.OKCYAN}[Profiler] Startup profile\n{self.format_table()}")
+        self.write_chrome_trace(self.output)
+        logger.info(f"{Colors.OKCYAN}[Profiler] Chrome trace written to {self.output}")
+        return False
+
+    def format_table(self) -> str:
+        rows = sorted(self.events, key=lambda event: event[3], reverse=True)
+        width = max((len(name) for name, *_ in rows), default=4)
+
+        lines = [f"{'name':<{width}}  {'category':<8}  {'start':>9}  {'duration':>9}"]
+        lines.extend(
+            f"{name:<{width}}  {category:<8}  "
+            f"{start * 1000:>7.1f}ms  {duration * 1000:>7.1f}ms"
+            for name, category, start, duration in rows
+        )
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, path: str):
+        pid = os.getpid()
+        trace = {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": round(start * 1_000_000),
+                    "dur": round(duration * 1_000_000),
+                    "pid": pid,
+                    "tid": pid,
+                }
+                for name, category, start, duration in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+        with open(path, "w") as file:
+            json.dump(trace, file, indent=2)
+
+
+# Enabled by main once it parsed --profile-startup, widgets and services are only
+# imported after that, so none of them is created before
+profiler = StartupProfiler()
@@ -0,0 +1,50 @@
+from array import array
+
+
+class RingBuffer:
+    """Class to keep the last ``size`` samples of a metric in a fixed array."""
+
+    def __init__(self, size: int):
+        self.size = size
+        # Allocated once, memory use stays the same no matter how long it runs
+        self.data = array("f", bytes(4 * size))
+        self.view = memoryview(self.data)
+        self.index = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, value: float):
+        self.data[self.index] = value
+        self.index = (self.index + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def clear(self):
+        self.index = 0
+        self.count = 0
+
+    def window(self, count: int | None = None) -> tuple[memoryview, memoryview]:
+        """Return the last ``count`` samples, oldest first, as two slices."""
+        count = self.count if count is None else min(count, self.count)
+        start = self.index - count
+
+        # The window wraps around the end of the array
+        if start < 0:
+            return self.view[start + self.size :], self.view[: self.index]
+        return self.view[start : self.index], self.view[:0]
+
+    def last(self) -> float:
+        return self.data[self.index - 1] if self.count else 0.0
+
+    def min(self, count: int | None = None) -> float:
+        return min((min(part) for part in self.window(count) if part), default=0.0)
+
+    def max(self, count: int | None = None) -> float:
+        return max((max(part) for part in self.window(count) if part), default=0.0)
+
+    def avg(self, count: int | None = None) -> float:
+        head, tail = self.window(count)
+        length = len(head) + len(tail)
+        return (sum(head) + sum(tail)) / length if length else 0.0
@@ -0,0 +1,229 @@
+import math
+import time
+from typing import Callable
+
+from gi.repository import GLib
+
+
+class TimerTask:
+    """A callback registered with the timer wheel."""
+
+    __slots__ = ("args", "callback", "due", "id", "interval")
+
+    def __init__(self, id: int, interval: int, callback: Callable, args: tuple):
+        self.id = id
+        # Requested interval in ms, 0 for tasks that only run once
+        self.interval = interval
+        self.callback = callback
+        self.args = args
+        self.due = 0
+
+
+class TimerWheel:
+    """Class to run periodic callbacks together on shared, aligned ticks.
+
+    Intervals are rounded up to a multiple of ``resolution`` and every task fires
+    on multiples of its interval, so a 2 s and a 4 s poller wake up the process
+    once every 4 s instead of twice. Every interval is multiplied by ``scale``,
+    which lets a power policy slow down all polling at once.
+    """
+
+    def __init__(self, resolution: int = 250):
+        self.resolution = resolution
+        self.scale = 1.0
+        # Periodic tasks are held back while there is any reason to pause them
+        self._pause_reasons: set[str] = set()
+
+        # Tasks keyed by the tick they are due on, a tick lasts `resolution` ms
+        self._buckets: dict[int, list[TimerTask]] = {}
+        self._tasks: dict[int, TimerTask] = {}
+        self._next_id = 1
+
+        self._source_id = None
+        self._armed_tick = None
+
+        # Wakeups of the main loop versus callbacks run, to see how much is shared
+        self.wakeups = 0
+        self.calls = 0
+        self._stats_since = time.monotonic()
+
+    def _now(self) -> float:
+        return time.monotonic() * 1000
+
+    def _tick(self, now: float) -> int:
+        # Timers may fire a hair early, so round within a millisecond to the tick
+        return int((now + 1) // self.resolution)
+
+    def add(
+        self,
+        interval: int,
+        callback: Callable,
+        *args,
+        initial_call: bool = True,
+    ) -> int:
+        """Run ``callback`` every ``interval`` ms for as long as it returns True.
+
+        Mirrors fabric's ``invoke_repeater``, returns an id to pass to ``remove``.
+        """
+        task = TimerTask(self._next_id, interval, callback, args)
+        self._next_id += 1
+
+        # Like invoke_repeater, only later calls decide whether the task repeats
+        if initial_call:
+            callback(*args)
+
+        self._tasks[task.id] = task
+        self._schedule(task, self._tick(self._now()))
+        self._arm()
+        return task.id
+
+    def call_later(self, delay: int, callback: Callable, *args) -> int:
+        """Run ``callback`` once after at least ``delay`` ms."""
+
+        def once(*args):
+            callback(*args)
+            return False
+
+        task = TimerTask(self._next_id, 0, once, args)
+        self._next_id += 1
+        self._tasks[task.id] = task
+
+        task.due = math.ceil((self._now() + delay) / self.resolution)
+        self._buckets.setdefault(task.due, []).append(task)
+        self._arm()
+        return task.id
+
+    def set_scale(self, scale: float):
+        """Multiply every periodic interval by ``scale``, applied right away."""
+        if scale == self.scale:
+            return
+        self.scale = scale
+
+        now = self._tick(self._now())
+        for task in self._tasks.values():
+            if not task.interval:
+                continue
+            self._unbucket(task)
+            self._schedule(task, now)
+        self._arm()
+
+    @property
+    def paused(self) -> bool:
+        return bool(self._pause_reasons)
+
+    def pause(self, reason: str):
+        """Hold back every periodic task until ``resume`` is called with ``reason``.
+
+        One-shot tasks from ``call_later`` keep running while paused.
+        """
+        if reason in self._pause_reasons:
+            return
+        self._pause_reasons.add(reason)
+        if len(self._pause_reasons) > 1:
+            return
+
+        for task in self._tasks.values():
+            if task.interval:
+                self._unbucket(task)
+        self._arm()
+
+    def resume(self, reason: str):
+        """Undo ``pause`` for ``reason``, tasks run again once no reason is left.
+
+        Tasks that came due while paused run right away, the others keep their tick.
+        """
+        if reason not in self._pause_reasons:
+            return
+        self._pause_reasons.discard(reason)
+        if self._pause_reasons:
+            return
+
+        now = self._tick(self._now())
+        for task in [task for task in self._tasks.values() if task.interval]:
+            if task.due <= now:
+                # Catch up right away so nothing stale is shown until the next tick
+                self._run(task, now)
+            else:
+                self._buckets.setdefault(task.due, []).append(task)
+        self._arm()
+
+    def remove(self, task_id: int | None):
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return
+
+        self._unbucket(task)
+        self._arm()
+
+    def wakeups_per_second(self) -> float:
+        elapsed = time.monotonic() - self._stats_since
+        return self.wakeups / elapsed if elapsed > 0 else 0.0
+
+    def reset_stats(self):
+        self.wakeups = 0
+        self.calls = 0
+        self._stats_since = time.monotonic()
+
+    def _schedule(self, task: TimerTask, tick: int):
+        ticks = max(1, math.ceil(task.interval * self.scale / self.resolution))
+        # Align to multiples of the interval so tasks with compatible intervals meet
+        task.due = (tick // ticks + 1) * ticks
+
+        # While paused the due tick is only kept, resume buckets the task again
+        if task.interval and self._pause_reasons:
+            return
+        self._buckets.setdefault(task.due, []).append(task)
+
+    def _unbucket(self, task: TimerTask):
+        bucket = self._buckets.get(task.due)
+        if bucket and task in bucket:
+            bucket.remove(task)
+            if not bucket:
+                del self._buckets[task.due]
+
+    def _arm(self):
+        tick = min(self._buckets, default=None)
+        if tick == self._armed_tick:
+            return
+
+        if self._source_id:
+            GLib.source_remove(self._source_id)
+            self._source_id = None
+
+        self._armed_tick = tick
+        if tick is not None:
+            delay = max(0, math.ceil(tick * self.resolution - self._now()))
+            self._source_id = GLib.timeout_add(delay, self._on_wakeup)
+
+    def _on_wakeup(self):
+        self._source_id = None
+        self._armed_tick = None
+        self.wakeups += 1
+
+        now = self._tick(self._now())
+        for tick in sorted(tick for tick in self._buckets if tick <= now):
+            for task in self._buckets.pop(tick):
+                self._run(task, now)
+
+        self._arm()
+        return False
+
+    def _run(self, task: TimerTask, tick: int):
+        # A callback that ran earlier in this wakeup may have removed the task
+        if task.id not in self._tasks:
+            return
+
+        self.calls += 1
+        repeat = task.callback(*task.args)
+
+        # The callback may also have removed its own task
+        if task.id not in self._tasks:
+            return
+        if repeat:
+            self._schedule(task, tick)
+        else:
+            del self._tasks[task.id]
+
+
+# Shared by every poller so their wakeups line up
+scheduler = TimerWheel()
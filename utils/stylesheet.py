@@ -0,0 +1,226 @@
+import hashlib
+import os
+import re
+import subprocess
+import time
+
+from fabric.utils import get_relative_path
+from loguru import logger
+
+from utils.colors import Colors
+
+# Entry point of the stylesheet and where the compiled css ends up
+STYLES_DIR = get_relative_path("../styles")
+DIST_DIR = get_relative_path("../dist")
+MAIN_SCSS = os.path.join(STYLES_DIR, "main.scss")
+MAIN_CSS = os.path.join(DIST_DIR, "main.css")
+
+# Theme sources and the per-theme compiled palettes
+PALETTE_SCSS = os.path.join(STYLES_DIR, "palette.scss")
+THEMES_DIR = os.path.join(STYLES_DIR, "themes")
+THEMES_CSS_DIR = os.path.join(DIST_DIR, "themes")
+DEFAULT_THEME = "catpuccin-mocha"
+
+# Extra arguments passed to sass, part of the cache key as they change the output
+SASS_ARGS = ("--no-source-map",)
+
+# Matches the targets of @use, @forward and @import rules
+SCSS_IMPORT_RE = re.compile(r"""@(?:use|forward|import)\s+["']([^"']+)["']""")
+
+
+# Function to resolve an scss import to a file on disk
+def resolve_scss_import(
+    target: str, base_dir: str, load_paths: tuple[str, ...] = ()
+) -> str | None:
+    # Built-in modules like "sass:color" do not live on disk
+    if target.startswith("sass:"):
+        return None
+
+    # Sass looks relative to the importing file first, then in the load paths
+    for search_dir in (base_dir, *load_paths):
+        directory, name = os.path.split(os.path.join(search_dir, target))
+        stem = name[:-5] if name.endswith(".scss") else name
+
+        for candidate in (f"{stem}.scss", f"_{stem}.scss", f"{stem}/_index.scss"):
+            path = os.path.join(directory, candidate)
+            if os.path.isfile(path):
+                return os.path.normpath(path)
+    return None
+
+
+# Function to collect every scss file reachable from the entry point
+def get_scss_dependencies(
+    entry: str = MAIN_SCSS, load_paths: tuple[str, ...] = ()
+) -> list[str]:
+    seen = set()
+    stack = [os.path.normpath(entry)]
+
+    while stack:
+        path = stack.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+
+        with open(path) as file:
+            content = file.read()
+
+        for target in SCSS_IMPORT_RE.findall(content):
+            dependency = resolve_scss_import(
+                target, os.path.dirname(path), load_paths
+            )
+            if dependency and dependency not in seen:
+                stack.append(dependency)
+
+    return sorted(seen)
+
+
+# Function to hash the content of every file the stylesheet is built from
+def hash_scss_sources(
+    entry: str = MAIN_SCSS, load_paths: tuple[str, ...] = ()
+) -> str:
+    digest = hashlib.sha256()
+
+    for arg in SASS_ARGS:
+        digest.update(arg.encode())
+        digest.update(b"\0")
+
+    for path in get_scss_dependencies(entry, load_paths):
+        digest.update(os.path.relpath(path, STYLES_DIR).encode())
+        digest.update(b"\0")
+        with open(path, "rb") as file:
+            digest.update(file.read())
+        digest.update(b"\0")
+
+    return digest.hexdigest()
+
+
+# Function to get the path of the stamp file storing the hash of a compiled css
+def get_hash_stamp(output: str) -> str:
+    return f"{output}.sha256"
+
+
+# Function to read the hash of the sources a compiled css was built from
+def read_hash_stamp(output: str) -> str | None:
+    try:
+        with open(get_hash_stamp(output)) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+# Function to check whether a compiled css was built from the given sources
+def is_css_fresh(output: str, source_hash: str) -> bool:
+    return os.path.isfile(output) and read_hash_stamp(output) == source_hash
+
+
+# Function to record the hash of the sources a css file was compiled from
+def write_hash_stamp(output: str, source_hash: str):
+    with open(get_hash_stamp(output), "w") as file:
+        file.write(source_hash)
+
+
+# Function to build the sass command line for a one-shot compile
+def get_sass_command(
+    entry: str, output: str, load_paths: tuple[str, ...] = ()
+) -> list[str]:
+    return [
+        "sass",
+        *(f"--load-path={path}" for path in load_paths),
+        *SASS_ARGS,
+        entry,
+        output,
+    ]
+
+
+# Function to compile scss into css, skipping sass when the sources are unchanged
+def compile_scss(
+    entry: str = MAIN_SCSS,
+    output: str = MAIN_CSS,
+    load_paths: tuple[str, ...] = (),
+) -> bool:
+    """Compile ``entry`` into ``output``, returns False if sass failed."""
+    start = time.perf_counter()
+    source_hash = hash_scss_sources(entry, load_paths)
+
+    if is_css_fresh(output, source_hash):
+        logger.info(
+            f"{Colors.OKBLUE}[CSS] Reusing cached css "
+            f"({(time.perf_counter() - start) * 1000:.1f} ms)"
+        )
+        return True
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+
+    result = subprocess.run(
+        get_sass_command(entry, output, load_paths),
+        capture_output=True,
+        text=True,
+    )
+
+    if result.returncode != 0:
+        logger.error(f"{Colors.FAIL}[CSS] Failed to compile: {result.stderr.strip()}")
+        return False
+
+    write_hash_stamp(output, source_hash)
+    logger.info(
+        f"{Colors.OKBLUE}[CSS] Compiled css "
+        f"({(time.perf_counter() - start) * 1000:.1f} ms)"
+    )
+    return True
+
+
+# Function to list the names of the available themes
+def get_theme_names() -> list[str]:
+    return sorted(
+        file[:-5] for file in os.listdir(THEMES_DIR) if file.endswith(".scss")
+    )
+
+
+# Function to fall back to the default theme when a theme does not exist
+def resolve_theme(theme: str) -> str:
+    if os.path.isfile(os.path.join(THEMES_DIR, f"{theme}.scss")):
+        return theme
+
+    logger.warning(
+        f"{Colors.WARNING}Warning: The theme file '{theme}.scss' was not found. Using default theme."
+    )
+    return DEFAULT_THEME
+
+
+# Function to get the path of the compiled palette of a theme
+def get_theme_css(theme: str) -> str:
+    return os.path.join(THEMES_CSS_DIR, f"{theme}.css")
+
+
+# Function to get the load path that makes `@use "selected-theme"` resolve to a theme
+def get_theme_load_path(theme: str) -> str:
+    load_path = os.path.join(THEMES_CSS_DIR, theme)
+    stub = os.path.join(load_path, "selected-theme.scss")
+    target = os.path.relpath(os.path.join(THEMES_DIR, theme), load_path)
+    content = f'@forward "{target}";\n'
+
+    # The stub is generated, so it is only written when it is missing or outdated
+    try:
+        with open(stub) as file:
+            if file.read() == content:
+                return load_path
+    except OSError:
+        pass
+
+    os.makedirs(load_path, exist_ok=True)
+    with open(stub, "w") as file:
+        file.write(content)
+    return load_path
+
+
+# Function to compile the palette of a single theme
+def compile_theme(theme: str) -> str | None:
+    output = get_theme_css(theme)
+    if compile_scss(PALETTE_SCSS, output, (get_theme_load_path(theme),)):
+        return output
+    return None
+
+
+# Function to compile the palette of every theme, returns the ones that failed
+def compile_all_themes() -> list[str]:
+    return [theme for theme in get_theme_names() if not compile_theme(theme)]
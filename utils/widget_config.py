@@ -76,6 +76,7 @@ DEFAULT_CONFIG = {
         "enable_icon": True,
         "truncation": True,
         "truncation_size": 50,
+        "title_map": [],
     },
     "updates": {
         "os": "arch",
@@ -116,6 +117,15 @@ DEFAULT_CONFIG = {
     "task_bar": {"icon_size": 22},
     "system_tray": {"icon_size": 22, "ignore": []},
     "power": {"icon": "󰐥", "icon_size": "18px", "tooltip": True},
+    "polling": {
+        # Every polling interval is multiplied by these while they apply
+        "battery_multiplier": 2,
+        "profile_multipliers": {
+            "power-saver": 2,
+            "balanced": 1,
+            "performance": 1,
+        },
+    },
     "theme_switcher": {
         "icon": "",
         "icon_size": "14px",
@@ -231,6 +241,7 @@ class WindowTitle(TypedDict):
     enable_icon: bool
     truncation: bool
     truncation_size: int
+    title_map: list[list[str]]
 
 
 class Updates(TypedDict, BaseConfig):
@@ -269,6 +280,13 @@ class ThemeSwitcher(TypedDict, BaseConfig):
     icon: str
 
 
+class Polling(TypedDict):
+    """Configuration for the power-aware polling policy"""
+
+    battery_multiplier: float
+    profile_multipliers: dict[str, float]
+
+
 class Language(TypedDict):
     """Configuration for language"""
 
@@ -302,6 +320,7 @@ class BarConfig(TypedDict):
     layout: Layout
     memory: Memory
     mpris: Mpris
+    polling: Polling
     storage: Storage
     system_tray: SystemTray
     task_bar: TaskBar
@@ -332,6 +351,10 @@ for key, value in parsed_data.items():
     if key in DEFAULT_CONFIG:
         parsed_data[key] = merge_defaults(value, DEFAULT_CONFIG[key])
 
+# Sections missing from the config file fall back to their defaults entirely
+for key, value in DEFAULT_CONFIG.items():
+    parsed_data.setdefault(key, value)
+
 
 ## TODO: validate the name of widget is within the dict
 
@@ -1,25 +1,69 @@
-# ruff: noqa: F403
-from .battery import *
-from .bluetooth import *
-from .brightness import *
-from .calendar import *
-from .clickcounter import *
-from .dashboard import *
-from .datetime import *
-from .hypridle import *
-from .hyprsunset import *
-from .kblayout import *
-from .language import *
-from .mpris import *
-from .powerbutton import *
-from .screenrecord import *
-from .stats import *
-from .stopwatch import *
-from .systray import *
-from .taskbar import *
-from .theme import *
-from .updates import *
-from .volume import *
-from .weather import *
-from .windowtitle import *
-from .workspace import *
+import importlib
+
+# Widgets that can be placed in the layout, mapped to the module and class
+# providing them. Modules are only imported once the layout references them.
+WIDGETS = {
+    # Workspaces: Displays the list of workspaces or desktops
+    "workspaces": ("widgets.workspace", "WorkSpacesWidget"),
+    "system_tray": ("widgets.systray", "SystemTray"),
+    "task_bar": ("widgets.taskbar", "TaskBarWidget"),
+    "calendar": ("widgets.calendar", "CalendarWidget"),
+    "bluetooth": ("widgets.bluetooth", "BlueToothWidget"),
+    "keyboard": ("widgets.kblayout", "KeyboardLayoutWidget"),
+    "brightness": ("widgets.brightness", "BrightnessWidget"),
+    "power": ("widgets.powerbutton", "PowerButton"),
+    # WindowTitle: Shows the title of the current window
+    "window_title": ("widgets.windowtitle", "WindowTitleWidget"),
+    # LanguageBox: Displays the current language selection
+    "language": ("widgets.language", "LanguageWidget"),
+    # DateTime: Displays the current date and time
+    "datetime": ("widgets.datetime", "DateTimeWidget"),
+    "volume": ("widgets.volume", "VolumeWidget"),
+    # HyprSunset: Provides information about the sunset time based on location
+    "hypr_sunset": ("widgets.hyprsunset", "HyprSunsetWidget"),
+    # HyprIdle: Shows the idle time for the system
+    "hypr_idle": ("widgets.hypridle", "HyprIdleWidget"),
+    # Battery: Displays the battery status with optional label and tooltip
+    "battery": ("widgets.battery", "Battery"),
+    # Cpu: Displays CPU usage information with optional label and tooltip
+    "cpu": ("widgets.stats", "CpuWidget"),
+    # # ClickCounter: Tracks the number of clicks on a widget or component
+    # "click_counter": ("widgets.clickcounter", "ClickCounter"),
+    # Memory: Displays the system's memory usage
+    "memory": ("widgets.stats", "MemoryWidget"),
+    # Storage: Shows the system's storage usage (e.g., disk space)
+    "storage": ("widgets.stats", "StorageWidget"),
+    # Weather: Displays the weather for a given city (e.g., Kathmandu)
+    "weather": ("widgets.weather", "WeatherWidget"),
+    # Mpris: Displays information about the current media player status
+    "mpris": ("widgets.mpris", "Mpris"),
+    # Updates: Shows available system updates based on the OS
+    "updates": ("widgets.updates", "UpdatesWidget"),
+    "theme_switcher": ("widgets.theme", "ThemeSwitcherWidget"),
+}
+
+# Classes that are not placed in the layout but can still be imported from here
+EXTRA_EXPORTS = {
+    "ClickCounter": "widgets.clickcounter",
+    "PowerMenuPopup": "widgets.powerbutton",
+    "PowerControlButtons": "widgets.powerbutton",
+    "ScreenCorners": "widgets.corners",
+    "ScreenRecord": "widgets.screenrecord",
+    "WeatherMenu": "widgets.weather",
+}
+
+
+def get_widget(name: str) -> type:
+    """Import and return the widget class registered under ``name``."""
+    module_name, class_name = WIDGETS[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def __getattr__(name: str):
+    # Resolve `from widgets import X` lazily instead of importing every widget
+    module_name = EXTRA_EXPORTS.get(name) or next(
+        (module for module, cls in WIDGETS.values() if cls == name), None
+    )
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
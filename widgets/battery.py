@@ -1,11 +1,11 @@
 import math
 
-import psutil
-from fabric.utils import invoke_repeater
 from fabric.widgets.box import Box
 from fabric.widgets.image import Image
 from fabric.widgets.label import Label
 
+from shared import LazyTooltip, binder
+from utils.config import get_battery_service
 from utils.functions import format_time
 from utils.widget_config import BarConfig
 
@@ -22,61 +22,58 @@ class Battery(Box):
         self.config = widget_config["battery"]
         self.full_battery_level = 100
 
-        # Set up a repeater to call the update_battery_status method
-        invoke_repeater(
-            self.config["interval"], self.update_battery_status, initial_call=True
-        )
-
-    def update_battery_status(self):
-        """Update the battery status by fetching the current battery information
-        and updating the widget accordingly.
-        """
-        # Get the battery status
-        battery = psutil.sensors_battery()
-
-        if battery is None:
-            self.hide()
-            return None
-
-        battery_percent = round(battery.percent) if battery else 0
-
+        # Created once and updated in place whenever the battery changes
         self.battery_label = Label(
-            label=f"{battery_percent}%", style_classes="panel-text", visible=False
+            label="0%", style_classes="panel-text", visible=False
         )
+        self.battery_icon = Image(icon_size=14)
+        self.children = (self.battery_icon, self.battery_label)
 
-        is_charging = battery.power_plugged if battery else False
-
-        self.battery_icon = Image(
-            icon_name=self.get_icon_name(
+        if self.config["tooltip"]:
+            LazyTooltip(self, get_text=self.get_tooltip)
+
+        self.battery_service = get_battery_service()
+        self.battery_service.connect("changed", self.update_battery_status)
+        self.update_battery_status()
+
+    def update_battery_status(self, *_):
+        """Update the widget from the current battery information."""
+        if not self.battery_service.present:
+            binder.set_visible(self, False)
+            return
+
+        battery_percent = self.battery_service.percentage
+        is_charging = self.battery_service.charging
+
+        binder.set_label(self.battery_label, f"{battery_percent}%")
+        binder.set(
+            self.battery_icon,
+            "set_from_icon_name",
+            self.get_icon_name(
                 battery_percent=battery_percent,
                 is_charging=is_charging,
             ),
-            icon_size=14,
         )
-
-        self.children = (self.battery_icon, self.battery_label)
+        binder.set_visible(self, True)
 
         # Update the label with the battery percentage if enabled
         if self.config["label"]:
-            self.battery_label.show()
-
             ## Hide the label when the battery is full
-            if (
-                self.config["hide_label_when_full"]
-                and battery_percent == self.full_battery_level
-            ):
-                self.battery_label.hide()
-
-        # Update the tooltip with the battery status details if enabled
-        if self.config["tooltip"]:
-            if battery_percent == self.full_battery_level:
-                self.set_tooltip_text("Full")
-            elif is_charging and battery_percent < self.full_battery_level:
-                self.set_tooltip_text(f"Time to full: {format_time(battery.secsleft)}")
-            else:
-                self.set_tooltip_text(f"Time to empty: {format_time(battery.secsleft)}")
-
-        return True
+            binder.set_visible(
+                self.battery_label,
+                not (
+                    self.config["hide_label_when_full"]
+                    and battery_percent == self.full_battery_level
+                ),
+            )
+
+    def get_tooltip(self):
+        """Describe the battery status, only called when the tooltip is shown."""
+        if self.battery_service.percentage == self.full_battery_level:
+            return "Full"
+        if self.battery_service.charging:
+            return f"Time to full: {format_time(self.battery_service.time_to_full)}"
+        return f"Time to empty: {format_time(self.battery_service.time_to_empty)}"
 
     def get_icon_name(self, battery_percent: int, is_charging: bool):
         """Determine the icon name based on the battery percentage and charging status."""
@@ -4,6 +4,8 @@ from fabric.widgets.image import Image
 from fabric.widgets.label import Label
 
 import utils.icons as icons
+from shared import binder
+from utils.profiler import profiler
 from utils.widget_config import BarConfig
 
 
@@ -12,7 +14,8 @@ class BlueToothWidget(Box):
 
     def __init__(self, widget_config: BarConfig, **kwargs):
         super().__init__(**kwargs, style_classes="panel-box")
-        self.bluetooth_client = BluetoothClient()
+        with profiler.measure("BluetoothClient", "service"):
+            self.bluetooth_client = BluetoothClient()
 
         self.icons = icons.icons["bluetooth"]
 
@@ -26,6 +29,7 @@ class BlueToothWidget(Box):
         )
 
         self.bt_label = Label(label="", visible=False, style_classes="panel-text")
+        self.children = (self.bluetooth_icon, self.bt_label)
 
         self.bluetooth_client.connect("changed", self.update_bluetooth_status)
 
@@ -36,18 +40,14 @@ class BlueToothWidget(Box):
 
         icon = self.icons["enabled"] if bt_status == "on" else self.icons["disabled"]
 
-        if self.bluetooth_icon:
-            self.remove(self.bluetooth_icon)
-
-        self.bluetooth_icon.set_from_icon_name(icon, icon_size=self.icon_size)
-        self.children = (self.bluetooth_icon, self.bt_label)
+        binder.set(self.bluetooth_icon, "set_from_icon_name", icon, self.icon_size)
 
         if self.config["label"]:
-            self.bt_label.set_text(bt_status.capitalize())
-            self.bt_label.show()
+            binder.set(self.bt_label, "set_text", bt_status.capitalize())
+            binder.set_visible(self.bt_label, True)
 
         if self.config["tooltip"]:
-            self.set_tooltip_text(f"Bluetooth is {bt_status}")
+            binder.set_tooltip_text(self, f"Bluetooth is {bt_status}")
 
     def on_destroy(self):
         self.bluetooth_client.disconnect("changed", self.update_bluetooth_status)
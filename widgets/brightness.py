@@ -5,7 +5,8 @@ from fabric.widgets.label import Label
 from fabric.widgets.overlay import Overlay
 
 import utils.functions as helpers
-from utils.config import brightness_service
+from shared import binder
+from utils.config import get_brightness_service
 from utils.icons import brightness_text_icons
 from utils.widget_config import BarConfig
 
@@ -19,7 +20,7 @@ class BrightnessWidget(EventBox):
         self.config = widget_config["brightness"]
 
         # Initialize the audio service
-        self.brightness_service = brightness_service
+        self.brightness_service = get_brightness_service()
 
         normalized_brightness = helpers.convert_to_percent(
             self.brightness_service.screen_brightness,
@@ -81,7 +82,7 @@ class BrightnessWidget(EventBox):
 
     def on_brightness_changed(self, *_):
         if self.config["tooltip"]:
-            self.set_tooltip_text("")
+            binder.set_tooltip_text(self, "")
 
         self.update_brightness()
 
@@ -90,10 +91,12 @@ class BrightnessWidget(EventBox):
             self.brightness_service.screen_brightness,
             self.brightness_service.max_screen,
         )
-        self.progress_bar.set_value(normalized_brightness / 100)
+        binder.set(self.progress_bar, "set_value", normalized_brightness / 100)
 
-        self.brightness_label.set_text(f"{normalized_brightness}%")
+        binder.set(self.brightness_label, "set_text", f"{normalized_brightness}%")
 
-        self.icon.set_text(
-            helpers.get_brightness_icon_name(normalized_brightness)["text_icon"]
+        binder.set(
+            self.icon,
+            "set_text",
+            helpers.get_brightness_icon_name(normalized_brightness)["text_icon"],
         )
@@ -9,8 +9,9 @@ from fabric.widgets.eventbox import EventBox
 from fabric.widgets.label import Label
 from fabric.widgets.overlay import Overlay
 from fabric.widgets.revealer import Revealer
-from gi.repository import GLib, Gtk
+from gi.repository import Gtk
 
+from utils.scheduler import scheduler
 from utils.widget_config import BarConfig
 
 gi.require_version("Gtk", "3.0")
@@ -129,7 +130,8 @@ class CalendarWidget(EventBox):
 
         self.update_calendar()
         self.reset_calendar()
-        GLib.timeout_add_seconds(1, self.check_date_change)
+        # Noticing a new day up to a minute late saves a wakeup every second
+        scheduler.add(60 * 1000, self.check_date_change, initial_call=False)
 
     def update_calendar(self):
         self.create_calendar(self.current_year, self.current_month)
@@ -272,4 +274,4 @@ class CalendarWidget(EventBox):
             self.current_year = now.year
             self.current_month = now.month
             self.update_calendar()
-        return True  # Ensure the function continues to be called every second
+        return True  # Ensure the function continues to be called every minute
@@ -1,13 +1,35 @@
-import psutil
-from fabric.utils import invoke_repeater
 from fabric.widgets.box import Box
 from fabric.widgets.label import Label
+from gi.repository import GLib
 
 import utils.functions as helpers
+from services.systemstats import CpuStats, MemoryStats, StorageStats
+from shared import BarChart, LazyTooltip, Sparkline, binder
+from utils.config import get_system_stats_service
 from utils.icons import common_text_icons
 from utils.widget_config import BarConfig
 
 
+class HistoryTooltip(Box):
+    """A tooltip showing a summary of a metric above a sparkline of its history."""
+
+    def __init__(self, metrics: list[str], extra_charts=(), **kwargs):
+        super().__init__(orientation="v", spacing=4, name="history-tooltip", **kwargs)
+
+        self.label = Label(h_align="start")
+        self.sparklines = [
+            Sparkline(get_system_stats_service().history[metric]) for metric in metrics
+        ]
+        self.charts = [*self.sparklines, *extra_charts]
+        self.children = (self.label, *self.charts)
+        self.show_all()
+
+    def update(self, text: str):
+        self.label.set_label(text)
+        for chart in self.charts:
+            chart.queue_draw()
+
+
 class CpuWidget(Box):
     """A widget to display the current CPU usage."""
 
@@ -28,18 +50,37 @@ class CpuWidget(Box):
             label="0%", style_classes="panel-text", visible=False
         )
 
-        self.children = (self.text_icon, self.cpu_level)
+        self.children = (self.text_icon, self.cpu_level_label)
 
-        # Set up a repeater to call the update_label method at specified intervals
-        invoke_repeater(self.config["interval"], self.update_label, initial_call=True)
+        # The tooltip with the usage history is only built once it is hovered
+        self.history_tooltip = None
+        if self.config["tooltip"]:
+            LazyTooltip(self, get_custom=self.get_tooltip)
+
+        # Samples are shared with every other widget showing the cpu usage
+        get_system_stats_service().connect("cpu", self.update_label)
+        get_system_stats_service().watch("cpu", self.config["interval"])
 
-    def update_label(self):
+    def update_label(self, _, stats: CpuStats):
         # Update the label with the current CPU usage if enabled
         if self.config["label"]:
-            self.cpu_level_label.show()
-            self.cpu_level_label.set_label(f"{psutil.cpu_percent()}%")
+            binder.set_visible(self.cpu_level_label, True)
+            binder.set_label(self.cpu_level_label, f"{stats.percent}%")
+
+    def get_tooltip(self):
+        system_stats_service = get_system_stats_service()
+        if self.history_tooltip is None:
+            # One bar per core next to the history of the total usage
+            self.history_tooltip = HistoryTooltip(
+                ["cpu"], extra_charts=[BarChart(system_stats_service.core_history)]
+            )
 
-        return True
+        history = system_stats_service.history["cpu"]
+        self.history_tooltip.update(
+            f"󰍛 {history.last():.1f}%\n"
+            f"min {history.min():.1f}%  avg {history.avg():.1f}%  max {history.max():.1f}%"
+        )
+        return self.history_tooltip
 
 
 class MemoryWidget(Box):
@@ -63,27 +104,43 @@ class MemoryWidget(Box):
 
         self.children = (self.icon, self.memory_level_label)
 
-        # Set up a repeater to call the update_values method at specified intervals
-        invoke_repeater(self.config["interval"], self.update_values, initial_call=True)
+        # The tooltip with the usage history is only built once it is hovered
+        self.history_tooltip = None
+        if self.config["tooltip"]:
+            LazyTooltip(self, get_custom=self.get_tooltip)
+
+        # Samples are shared with every other widget showing the memory usage
+        get_system_stats_service().connect("memory", self.update_values)
+        get_system_stats_service().watch("memory", self.config["interval"])
 
-    def update_values(self):
+    def update_values(self, _, stats: MemoryStats):
         # Get the current memory usage
-        self.used_memory = psutil.virtual_memory().used
-        self.total_memory = psutil.virtual_memory().total
-        self.percent_used = psutil.virtual_memory().percent
+        self.used_memory = stats.used
+        self.total_memory = stats.total
+        self.percent_used = stats.percent
+        self.swap_percent = stats.swap_percent if stats.swap_total else None
 
         # Update the label with the used memory if enabled
         if self.config["label"]:
-            self.memory_level_label.set_label(self.get_used())
-            self.memory_level_label.show()
+            binder.set_label(self.memory_level_label, self.get_used())
+            binder.set_visible(self.memory_level_label, True)
 
-        # Update the tooltip with the memory usage details if enabled
-        if self.config["tooltip"]:
-            self.set_tooltip_text(
-                f"󰾆 {psutil.virtual_memory().percent}%\n{common_text_icons['memory']} {self.get_used()}/{self.get_total()}",
-            )
+    def get_tooltip(self):
+        if self.history_tooltip is None:
+            self.history_tooltip = HistoryTooltip(["memory", "swap"])
+
+        history = get_system_stats_service().history["memory"]
+        text = (
+            f"󰾆 {self.percent_used}%\n{common_text_icons['memory']} {self.get_used()}/{self.get_total()}\n"
+            f"min {history.min():.1f}%  avg {history.avg():.1f}%  max {history.max():.1f}%"
+        )
+        # The swap line is only drawn when there is swap to speak of
+        self.history_tooltip.sparklines[1].set_visible(self.swap_percent is not None)
+        if self.swap_percent is not None:
+            text += f"\nswap {self.swap_percent}%"
 
-        return True
+        self.history_tooltip.update(text)
+        return self.history_tooltip
 
     def get_used(self):
         return f"{format(helpers.convert_bytes(self.used_memory, 'gb'),'.1f')}"
@@ -113,25 +170,39 @@ class StorageWidget(Box):
 
         self.children = (self.icon, self.storage_level_label)
 
-        # Set up a repeater to call the update_values method at specified intervals
-        invoke_repeater(self.config["interval"], self.update_values, initial_call=True)
+        if self.config["tooltip"]:
+            LazyTooltip(self, get_text=self.get_tooltip, markup=True)
+
+        # Samples are shared with every other widget showing the storage usage
+        get_system_stats_service().connect("storage", self.update_values)
+        get_system_stats_service().watch("storage", self.config["interval"])
 
-    def update_values(self):
+    def update_values(self, _, stats: StorageStats):
         # Get the current disk usage
-        self.disk = psutil.disk_usage("/")
+        self.disk = stats
 
         # Update the label with the used storage if enabled
         if self.config["label"]:
-            self.storage_level_label.set_label(f"{self.get_used()}")
-            self.storage_level_label.show()
-
-        # Update the tooltip with the storage usage details if enabled
-        if self.config["tooltip"]:
-            self.set_tooltip_text(
-                f"󰾆 {self.disk.percent}%\n{common_text_icons['storage']} {self.get_used()}/{self.get_total()}",
+            binder.set_label(self.storage_level_label, f"{self.get_used()}")
+            binder.set_visible(self.storage_level_label, True)
+
+    def get_tooltip(self):
+        lines = [
+            f"󰾆 {self.disk.percent}%\n{common_text_icons['storage']} {self.get_used()}/{self.get_total()}",
+        ]
+
+        # GTK asks on every motion over the widget, so the mounts are sampled
+        # when the tooltip opens and reused for a few seconds
+        mounts = get_system_stats_service().sample_mounts()
+        if len(mounts) > 1:
+            width = max(len(mount.path) for mount in mounts)
+            lines.extend(
+                f"<tt>{GLib.markup_escape_text(mount.path.ljust(width))}  "
+                f"{mount.used / 1024**3:>6.1f}/{mount.total / 1024**3:.1f} GB  "
+                f"{mount.percent:>5.1f}%</tt>"
+                for mount in mounts
             )
-
-        return True
+        return "\n".join(lines)
 
     def get_used(self):
         return f"{format(helpers.convert_bytes(self.disk.used, 'gb'),'.1f')}"
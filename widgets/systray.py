@@ -4,6 +4,7 @@ from fabric.widgets.button import Button
 from fabric.widgets.image import Image
 from gi.repository import Gdk, GdkPixbuf, Gray, Gtk
 
+from utils.profiler import profiler
 from utils.widget_config import BarConfig
 
 gi.require_version("Gray", "0.1")
@@ -18,7 +19,8 @@ class SystemTray(Box):
 
         self.config = widget_config["system_tray"]
 
-        self.watcher = Gray.Watcher()
+        with profiler.measure("Gray.Watcher", "service"):
+            self.watcher = Gray.Watcher()
         self.watcher.connect("item-added", self.on_item_added)
 
     def on_item_added(self, _, identifier: str):
@@ -1,16 +1,14 @@
-import json
-import os
 from typing import TypedDict
 
-from fabric.hyprland.widgets import get_hyprland_connection
-from fabric.utils import exec_shell_command
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.widgets.image import Image
 from gi.repository import GdkPixbuf, GLib, Gtk
-from loguru import logger
 
-from utils.colors import Colors
+from shared import binder
+from utils.config import get_hyprland_state
+from utils.desktopentries import desktop_entries
+from utils.hyprland import get_hyprland_client
 from utils.widget_config import BarConfig
 
 
@@ -34,79 +32,90 @@ class TaskBarWidget(Box):
             name="taskbar",
             **kwargs,
         )
-        self.connection = get_hyprland_connection()
-
         self.config = widget_config["task_bar"]
 
         self.icon_theme = Gtk.IconTheme.get_default()
 
+        # Buttons of the windows on the taskbar, keyed by window address
+        self.buttons: dict[str, Button] = {}
+        self._render_id = None
+
         self.set_visible(False)
 
-        if self.connection.ready:
-            self.render_with_delay()
-        else:
-            self.connection.connect("event::ready", lambda *_: self.render_with_delay())
+        # Windows are read from the shared copy of hyprland's state
+        self.hyprland_state = get_hyprland_state()
+        self.hyprland_state.connect("changed", self.on_state_changed)
+        self.queue_render()
 
-        for event in (
-            "activewindow",
-            "openwindow",
-            "closewindow",
-            "changefloatingmode",
-        ):
-            self.connection.connect("event::" + event, lambda *_: self.render(None))
+    def on_state_changed(self, _, kind: str):
+        if kind in ("clients", "active"):
+            self.queue_render()
 
-    def render_with_delay(self, *_):
-        GLib.timeout_add(101, self.render)
+    def queue_render(self, *_):
+        # Bursts of events, like closing a window focusing another, render once
+        if self._render_id is None:
+            self._render_id = GLib.idle_add(
+                self.render, priority=GLib.PRIORITY_HIGH_IDLE
+            )
 
     def render(self, *_):
-        self.children = []
+        self._render_id = None
 
-        clients = self.fetch_clients()
-        active_window_address = self.get_active_window_address()
+        active_window_address = self.hyprland_state.active_address
 
         visible_clients = [
-            client for client in clients if client["mapped"] and not client["hidden"]
+            client
+            for client in self.hyprland_state.clients.values()
+            if client["mapped"] and not client["hidden"]
         ]
+        addresses = {client["address"] for client in visible_clients}
+
+        # Drop the buttons of windows that went away
+        for address in self.buttons.keys() - addresses:
+            self.buttons.pop(address).destroy()
+
+        children = self.get_children()
+        for position, client in enumerate(visible_clients):
+            address = client["address"]
+            button = self.buttons.get(address)
+            if button is None:
+                button = self.buttons[address] = self.create_button(client)
+                self.add(button)
+                button.show_all()
+                children = self.get_children()
 
-        if visible_clients:
-            for client in visible_clients:
-                window_class = client["initialClass"].lower()
-                icon = self.bake_window_icon(window_class)
+            # Only windows whose position changed are moved
+            if children[position] is not button:
+                self.reorder_child(button, position)
+                children = self.get_children()
 
-                button = Button(image=icon, tooltip_text=client["title"])
-                if client["address"] == active_window_address:
-                    button.connect(
-                        "button-press-event",
-                        self.on_icon_click,
-                        client["address"],
-                    )
+            binder.set_tooltip_text(button, client["title"])
+            if address == active_window_address:
+                button.add_style_class("active")
+            else:
+                button.remove_style_class("active")
 
-                self.add(button)
+        binder.set_visible(self, bool(visible_clients))
+        return False
 
-            self.set_visible(True)
-            self.show_all()
-        else:
-            self.set_visible(False)
+    def create_button(self, client: PagerClient) -> Button:
+        # The icon follows the initial class, which never changes for a window
+        icon = self.bake_window_icon(client["initialClass"].lower())
 
-    def get_active_window_address(self) -> str:
-        # Fetch the address of the currently active window
-        active_window_info = json.loads(
-            self.connection.send_command("j/activewindow").reply.decode(),
-        )
-        return active_window_info.get("address", "")
+        button = Button(image=icon, tooltip_text=client["title"])
+        button.connect("button-press-event", self.on_icon_click, client["address"])
+        return button
 
     def on_icon_click(self, widget, event, address):
-        exec_shell_command(f"hyprctl dispatch focuswindow address:{address}")
-
-    def fetch_clients(self) -> list[PagerClient]:
-        return json.loads(self.connection.send_command("j/clients").reply.decode())
+        get_hyprland_client().dispatch(f"focuswindow address:{address}")
 
     def bake_window_icon(
         self,
         window_class: str,
         fallback_icon: str = "image-missing",
     ) -> Image:
-        icon_name = self.get_icon_from_desktop_entry(window_class)
+        # Resolved from an index of the installed applications, not a scan
+        icon_name = desktop_entries.lookup(window_class)
 
         if icon_name:
             pixbuf = self.load_icon(icon_name)
@@ -115,29 +124,6 @@ class TaskBarWidget(Box):
 
         return Image(pixbuf=pixbuf, size=self.config["icon_size"])
 
-    def get_icon_from_desktop_entry(self, window_class: str) -> str:
-        for data_dir in GLib.get_system_data_dirs():
-            applications_dir = os.path.join(data_dir, "applications")
-
-            if os.path.isdir(applications_dir):
-                for desktop_file in os.listdir(applications_dir):
-                    if desktop_file.endswith(".desktop"):
-                        file_path = os.path.join(applications_dir, desktop_file)
-                        try:
-                            with open(file_path) as f:
-                                app_name = None
-                                icon_name = None
-                                for line in f:
-                                    if line.startswith("Name="):
-                                        app_name = line.split("=", 2)[1].strip().lower()
-                                    elif line.startswith("Icon=") and app_name:
-                                        icon_name = line.split("=", 2)[1].strip()
-                                        if window_class in app_name:
-                                            return icon_name
-                        except Exception as e:
-                            logger.error(f"{Colors.FAIL}Error reading {file_path}: {e}")
-        return None
-
     def load_icon(
         self,
         icon_name: str,
@@ -1,9 +1,8 @@
-import os
-
-from fabric.utils import get_relative_path
 from fabric.widgets.button import Button
 
-from utils.functions import copy_theme, text_icon
+from utils.config import get_theme_manager
+from utils.functions import text_icon
+from utils.stylesheet import get_theme_names
 from utils.widget_config import BarConfig
 
 
@@ -15,12 +14,7 @@ class ThemeSwitcherWidget(Button):
 
         self.config = widget_config["theme_switcher"]
 
-        theme_files = os.listdir(get_relative_path("../styles/themes"))
-
-        # Remove the '.scss' part from each string in the list
-        self.themes_list = [style.replace(".scss", "") for style in theme_files]
-
-        self.current_theme = self.themes_list[0]
+        self.themes_list = get_theme_names()
 
         self.children = text_icon(
             self.config["icon"],
@@ -32,7 +26,12 @@ class ThemeSwitcherWidget(Button):
 
     def cycle_themes(self, *_):
         """Cycle through the themes."""
-        copy_theme(self.current_theme)
-        self.current_theme = self.themes_list[
-            (self.themes_list.index(self.current_theme) + 1) % len(self.themes_list)
-        ]
+        theme_manager = get_theme_manager()
+        current_theme = theme_manager.theme
+        index = (
+            self.themes_list.index(current_theme)
+            if current_theme in self.themes_list
+            else -1
+        )
+        # Only swaps the precompiled stylesheet, sass runs if the bundle is missing
+        theme_manager.set_theme(self.themes_list[(index + 1) % len(self.themes_list)])
@@ -4,15 +4,16 @@ from fabric.utils import (
     bulk_connect,
     exec_shell_command_async,
     get_relative_path,
-    invoke_repeater,
 )
 from fabric.widgets.box import Box
 from fabric.widgets.eventbox import EventBox
 from fabric.widgets.label import Label
 from loguru import logger
 
+from shared import LazyTooltip
 from utils.colors import Colors
 from utils.functions import text_icon
+from utils.scheduler import scheduler
 from utils.widget_config import BarConfig
 
 
@@ -50,8 +51,13 @@ class UpdatesWidget(EventBox):
         if self.config["label"]:
             self.update_level_label.show()
 
+        # Only the latest output is kept, the tooltip reads it when hovered
+        self._tooltip_text = None
+        if self.config["tooltip"]:
+            LazyTooltip(self, get_text=lambda: self._tooltip_text)
+
         # Set up a repeater to call the update method at specified intervals
-        invoke_repeater(self.config["interval"], self.update, initial_call=True)
+        scheduler.add(self.config["interval"], self.update, initial_call=True)
 
         # Connect the button press event to the update method
         bulk_connect(
@@ -67,9 +73,7 @@ class UpdatesWidget(EventBox):
         if self.config["label"]:
             self.update_level_label.set_label(value["total"])
 
-        # Update the tooltip if enabled
-        if self.config["tooltip"]:
-            self.set_tooltip_text(value["tooltip"])
+        self._tooltip_text = value["tooltip"]
         return True
 
     def update(self):
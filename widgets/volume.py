@@ -5,7 +5,8 @@ from fabric.widgets.label import Label
 from fabric.widgets.overlay import Overlay
 
 import utils.functions as helpers
-from utils.config import audio_service
+from shared import binder
+from utils.config import get_audio_service
 from utils.icons import volume_text_icons
 from utils.widget_config import BarConfig
 
@@ -17,7 +18,7 @@ class VolumeWidget(EventBox):
         super().__init__(events=["scroll", "smooth-scroll"], **kwargs)
 
         # Initialize the audio service
-        self.audio = audio_service
+        self.audio = get_audio_service()
 
         self.config = widget_config["volume"]
 
@@ -77,7 +78,7 @@ class VolumeWidget(EventBox):
             return
 
         if self.config["tooltip"]:
-            self.set_tooltip_text(self.audio.speaker.description)
+            binder.set_tooltip_text(self, self.audio.speaker.description)
 
         self.audio.speaker.connect("notify::volume", self.update_volume)
         self.update_volume()
@@ -87,17 +88,20 @@ class VolumeWidget(EventBox):
         current_stream = self.audio.speaker
         if current_stream:
             current_stream.muted = not current_stream.muted
-            self.icon.set_text(
-                volume_text_icons["muted"]
-            ) if current_stream.muted else self.update_volume()
+            if current_stream.muted:
+                binder.set(self.icon, "set_text", volume_text_icons["muted"])
+            else:
+                self.update_volume()
 
     def update_volume(self, *_):
         if self.audio.speaker:
             volume = round(self.audio.speaker.volume)
-            self.progress_bar.set_value(volume / 100)
+            binder.set(self.progress_bar, "set_value", volume / 100)
 
-            self.volume_label.set_text(f"{volume}%")
+            binder.set(self.volume_label, "set_text", f"{volume}%")
 
-        self.icon.set_text(
-            helpers.get_audio_icon_name(volume, self.audio.speaker.muted)["text_icon"]
+        binder.set(
+            self.icon,
+            "set_text",
+            helpers.get_audio_icon_name(volume, self.audio.speaker.muted)["text_icon"],
         )
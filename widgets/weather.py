@@ -1,6 +1,5 @@
 import threading
 
-from fabric.utils import invoke_repeater
 from fabric.widgets.box import Box
 from fabric.widgets.centerbox import CenterBox
 from fabric.widgets.eventbox import EventBox
@@ -12,6 +11,7 @@ from shared import PopupWindow
 from utils.colors import Colors
 from utils.functions import text_icon
 from utils.icons import common_text_icons
+from utils.scheduler import scheduler
 from utils.widget_config import BarConfig
 
 
@@ -96,7 +96,7 @@ class WeatherWidget(EventBox):
         self.box.children = (self.weather_icon, self.weather_label)
 
         # Set up a repeater to call the update_label method at specified intervals
-        invoke_repeater(self.config["interval"], self.update_label, initial_call=True)
+        scheduler.add(self.config["interval"], self.update_label, initial_call=True)
 
     def update_label(self):
         weather_thread = threading.Thread(
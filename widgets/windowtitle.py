@@ -1,16 +1,14 @@
-import re
-
 from fabric.hyprland.widgets import ActiveWindow
 from fabric.utils import FormattedString, truncate
 from fabric.widgets.box import Box
 
+from utils.classmatcher import WindowClassMatcher
 from utils.widget_config import BarConfig
 
 # TODO: replace with actual image
 # Mapping of window classes to icons and titles
+# User provided values from `window_title.title_map` are merged in ahead of these
 WINDOW_TITLE_MAP = [
-    # user provided values
-    # ...options.bar.windowtitle.title_map.value,
     # Original Entries
     ["kitty", "󰄛", "Kitty Terminal"],
     ["firefox", "󰈹", "Firefox"],
@@ -114,6 +112,11 @@ class WindowTitleWidget(Box):
         # Store the configuration for the window title
         self.config = widget_config["window_title"]
 
+        # User mappings come first so they can override the built-in ones
+        self.matcher = WindowClassMatcher(
+            [*self.config["title_map"], *WINDOW_TITLE_MAP]
+        )
+
         # Create an ActiveWindow widget to track the active window
         self.window = ActiveWindow(
             name="window",
@@ -134,10 +137,7 @@ class WindowTitleWidget(Box):
             else win_title
         )
         # Find a matching window class in the windowTitleMap
-        matched_window = next(
-            (wt for wt in WINDOW_TITLE_MAP if re.search(wt[0], win_class.lower())),
-            None,
-        )
+        matched_window = self.matcher.match(win_class)
         # Return the formatted title with or without the icon
         if matched_window:
             return (